@@ -1,7 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, TextBox
-from scipy.optimize import brentq
+from solidstate import cooling, paramagnet, spin_lattice
+from solidstate.spin_view import SpinLatticeView
 
 plt.style.use("dark_background")
 
@@ -10,49 +11,46 @@ kB = 1.0
 muB = 1.0
 gJ = 2.0
 alpha = 0.05
-
-mJ = np.array([-0.5, 0.5])
+J = 0.5         # 7/2 for a Gd³⁺ salt
 
 n_spins = 64
 rows, cols = 8, 8
 # Increase spacing multiplier to spread arrows apart
 spacing = 4.0
-x_positions, y_positions = np.meshgrid(np.arange(cols)*spacing, np.arange(rows)*spacing)
-x_positions, y_positions = x_positions.flatten(), y_positions.flatten()
+
+# Nearest-neighbour exchange; 0 keeps the ideal (independent) salt
+J_ex = 0.0
+n_sweeps = 200
+
+# S(B, T) in the Weiss molecular field of the same exchange: the 4 neighbours
+# of the square lattice give B_eff = B + lam M with lam = 4 J_ex / moment²,
+# and the salt orders ferromagnetically below T_c, which floors the cooling.
+salt = paramagnet.MeanFieldSalt(J, gJ, muB, kB, alpha, lam=4*J_ex/(gJ*muB*J)**2)
+T_c = salt.ordering_temperature
+
+lattice = spin_lattice.IsingLattice((rows, cols), J_ex, moment=gJ*muB*J, seed=0)
 
 states = ["a: Random spins (high T & Low Field)",
           "b: Isothermal Magnetization (Field ON)",
           "c: Adiabatic Demagnetization (Field OFF, S=constant)"]
 current_state = 0
 
-# --- Entropy calculation with clipping ---
+# --- Entropy calculation (broadcasts over B and T) ---
 def entropy(B, T):
-    if T <= 0:
-        return 0.0
-    x = np.clip(mJ * gJ * muB * B / (kB * T), -700, 700)
-    Z = np.sum(np.exp(x))
-    p = np.exp(x) / Z
-    p = np.clip(p, 1e-12, 1.0)
-    S_spin = -kB * np.sum(p * np.log(p))
-    S_lattice = alpha * T**3
-    return S_spin + S_lattice
+    return salt.entropy(B, T)
 
 def sample_spins(B, T):
-    if T <= 0:
-        return np.ones(n_spins) * 0.5
-    probs = np.exp(mJ * gJ * muB * B / (kB * T))
-    probs /= probs.sum()
-    spins = np.random.choice(mJ, size=n_spins, p=probs)
-    return spins
+    # Ising limit of the salt when coupled: Metropolis sweeps from the previous state
+    return paramagnet.sample_spins(salt, B, T, n_spins, lattice if J_ex != 0 else None, n_sweeps)
 
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
 plt.subplots_adjust(bottom=0.3)
 
+# Arrows for small lattices, a blitted magnetization map for large ones.
 # Adjust quiver scale so arrows are longer
-quiver = ax1.quiver(x_positions, y_positions,
-                    np.zeros_like(x_positions), np.ones_like(y_positions),
-                    angles='xy', scale_units='xy', scale=0.5, color="orange",
-                    headwidth=3, headlength=4, headaxislength=3)
+spin_view = SpinLatticeView(ax1, (rows, cols), spacing,
+                            angles='xy', scale_units='xy', scale=0.5, color="orange",
+                            headwidth=3, headlength=4, headaxislength=3)
 ax1.set_xlim(-spacing, cols*spacing)
 ax1.set_ylim(-spacing, rows*spacing)
 ax1.set_aspect('equal')
@@ -62,10 +60,13 @@ T_vals = np.linspace(0.0, 3, 1000)
 B_values = [0.01, 0.1, 0.5, 1.0, 2.0, 3.0, 4.0]
 colors = plt.cm.plasma(np.linspace(0, 1, len(B_values)))
 
-for B, c in zip(B_values, colors):
-    S_vals = [entropy(B, Ti) for Ti in T_vals]
+S_curves = entropy(np.array(B_values)[:, None], T_vals)
+for B, S_vals, c in zip(B_values, S_curves, colors):
     ax2.plot(T_vals, S_vals, color=c, label=f"B={B:.2f}")
 
+if T_c > 0:
+    ax2.axvline(T_c, color="white", linestyle=":", linewidth=1, label=f"$T_c$={T_c:.2f}")
+
 dot, = ax2.plot([], [], "bo", markersize=8)
 ax2.set_xlabel("Temperature (T)")
 ax2.set_ylabel("Entropy (S)")
@@ -85,8 +86,7 @@ def update_plot():
 
     Si = entropy(0.01, Ti)
     Sb = entropy(Bb, Ti)
-    Tf = brentq(lambda T: entropy(0.01, T) - Sb, 0.01, Ti)
-    Sc = entropy(0.01, Tf)
+    Tf = float(cooling.final_temperature(salt, Ti, Bb, 0.01))
 
     path_a.set_data([Ti, Ti], [Si, Sb])
     path_b.set_data([Ti, Tf], [Sb, Sb])
@@ -110,8 +110,8 @@ def update_plot():
         dot.set_data([Tf], [Sb])
 
     u = np.zeros_like(spins)
-    v = np.where(spins > 0, 1, -1)
-    quiver.set_UVC(u, v)
+    v = spins / J
+    spin_view.set_spins(u.reshape(rows, cols), v.reshape(rows, cols))
 
     ax1.set_title(states[current_state])
     fig.canvas.draw_idle()
@@ -152,4 +152,5 @@ def submit_Bb(text):
 text_box_Bb.on_submit(submit_Bb)
 
 update_plot()
-plt.show()
+if __name__ == "__main__":
+    plt.show()
@@ -1,6 +1,14 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import PathCollection
+from matplotlib.patches import Patch
+from matplotlib.path import Path
+from matplotlib.transforms import Bbox
 from matplotlib.widgets import Button, Slider
+from solidstate import kronig_penney
+from solidstate.kronig_penney import f_alpha, BandCache, BandTable
+from solidstate.background import LatestWorker
 
 plt.style.use("dark_background")
 
@@ -9,19 +17,18 @@ P_init = 3 * np.pi / 2
 a = 1.0
 alpha_a = np.linspace(-8*np.pi, 8*np.pi, 20000)
 alpha_a[alpha_a == 0] = 1e-6
+n_bands = 8     # bands inside the plotted |αa| <= 8π range
 
-def f_alpha(alpha_a, P):
-    return P * np.sin(alpha_a) / alpha_a + np.cos(alpha_a)
+# Band edges over the whole slider range, tabulated once and reused across runs
+table_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kp_band_table.npz")
+band_table = BandTable.load_or_build(table_path, P_min=0.0, P_max=1000.0, n_bands=n_bands, a=a)
+band_cache = BandCache(n_bands, a, table=band_table)
 
 def compute_allowed(P):
-    f_vals = f_alpha(alpha_a, P)
-    allowed = np.abs(f_vals) <= 1
-    return allowed, f_vals
+    return kronig_penney.compute_allowed(alpha_a, P)
 
 def compute_allowed_energies(P):
-    allowed, _ = compute_allowed(P)
-    energy = (alpha_a[allowed] / a)**2
-    return energy
+    return kronig_penney.compute_allowed_energies(alpha_a, P, a)
 
 # --- Layout: two subplots side by side ---
 fig, (ax_left, ax_right) = plt.subplots(1, 2, figsize=(14, 6))
@@ -31,10 +38,19 @@ plt.subplots_adjust(bottom=0.25)
 f_vals = f_alpha(alpha_a, P_init)
 allowed_mask = np.abs(f_vals) <= 1
 
-line_lhs, = ax_left.plot(alpha_a, f_vals, color='cyan', lw=2.5, label="f(αa)")
-line_upper = ax_left.axhline(1, color='orange', linestyle='--', lw=2, visible=False)
-line_lower = ax_left.axhline(-1, color='orange', linestyle='--', lw=2, visible=False)
-fill_allowed_left = None
+# Allowed αa shaded as a one-row RGBA strip instead of a 20,000-point
+# fill_between polygon: a P change rewrites its alpha channel in place, and
+# antialiased resampling keeps narrow bands visible when zoomed out.
+allowed_rgba = np.zeros((1, alpha_a.size, 4), dtype=np.uint8)
+allowed_rgba[..., 1] = 255                      # lime
+allowed_rgba[0, :, 3] = allowed_mask * 64       # alpha 0.25
+fill_allowed_left = ax_left.imshow(allowed_rgba, extent=(alpha_a[0], alpha_a[-1], -2, 6), aspect='auto',
+                                   interpolation='antialiased', visible=False, animated=True)
+allowed_proxy = Patch(color='lime', alpha=0.25, label='Allowed')
+
+line_upper = ax_left.axhline(1, color='orange', linestyle='--', lw=2, visible=False, animated=True)
+line_lower = ax_left.axhline(-1, color='orange', linestyle='--', lw=2, visible=False, animated=True)
+line_lhs, = ax_left.plot(alpha_a, f_vals, color='cyan', lw=2.5, label="f(αa)", animated=True)
 
 ax_left.set_xlim(-4*np.pi, 4*np.pi)
 ax_left.set_ylim(-5, 10)
@@ -50,24 +66,20 @@ ax_left.set_xticklabels(xtick_labels, fontsize=12)
 ax_left.legend(loc='upper right', fontsize=12)
 
 # --- Right plot: Allowed energy bands ---
-bars = []
-def plot_bands(energies):
-    global bars
-    for bar in bars:
-        bar.remove()
-    bars = []
-    if len(energies) == 0:
-        return
-    energy_sorted = np.sort(energies)
-    gaps = np.diff(energy_sorted) > 0.1
-    band_edges = np.split(energy_sorted, np.where(gaps)[0]+1)
-    for band in band_edges:
-        if len(band) > 0:
-            bar = ax_right.axhspan(band[0], band[-1], color='lime', alpha=0.6)
-            bars.append(bar)
+# One collection of n_bands rectangles spanning the axes width; the paths
+# share band_xy, so new edges are written straight into their vertices.
+band_xy = np.zeros((n_bands, 5, 2))
+band_xy[:, [1, 2], 0] = 1
+bars = PathCollection([Path(xy, closed=True) for xy in band_xy], transform=ax_right.get_yaxis_transform(),
+                      facecolor='lime', edgecolor='none', alpha=0.6, animated=True)
+ax_right.add_collection(bars, autolim=False)
+
+def plot_bands(edges):
+    band_xy[:, [0, 1, 4], 1] = edges[:, :1]
+    band_xy[:, [2, 3], 1] = edges[:, 1:]
+    bars.stale = True
 
-allowed_energy = compute_allowed_energies(P_init)
-plot_bands(allowed_energy)
+plot_bands(band_cache(P_init))
 
 ax_right.set_xlim(0, 1)
 ax_right.set_ylim(0, 200)
@@ -79,41 +91,78 @@ ax_right.grid(alpha=0.3)
 # --- Stage control for left plot ---
 stage = [0]
 
-def update_plot(P):
-    global f_vals, allowed_mask, fill_allowed_left
-    f_vals = f_alpha(alpha_a, P)
-    allowed_mask = np.abs(f_vals) <= 1
+# --- Blitting: the animated artists are repainted onto cached axes backgrounds ---
+# The slider joins once it exists (see below); its region runs past the axes
+# to take in the value text.
+backgrounds = {}
+animated = {ax_left: [fill_allowed_left, line_upper, line_lower, line_lhs], ax_right: [bars]}
+
+def blit_region(ax):
+    if ax is not ax_slider:
+        return ax.bbox
+    pad = slider_P.valtext.get_fontsize() * fig.dpi / 72
+    return Bbox.from_extents(ax.bbox.x0, ax.bbox.y0 - pad, ax_prev.bbox.x0, ax.bbox.y1 + pad)
+
+def draw_animated(ax):
+    for artist in animated[ax]:
+        if artist.get_visible():
+            ax.draw_artist(artist)
+
+def on_draw(event):
+    for ax in animated:
+        backgrounds[ax] = fig.canvas.copy_from_bbox(blit_region(ax))
+        draw_animated(ax)
+
+def blit_plots(axes=None):
+    if not backgrounds:
+        fig.canvas.draw_idle()
+        return
+    for ax in axes or animated:
+        fig.canvas.restore_region(backgrounds[ax])
+        draw_animated(ax)
+        fig.canvas.blit(blit_region(ax))
+
+fig.canvas.mpl_connect("draw_event", on_draw)
+
+# Slider events only queue P; a worker thread computes the newest one and
+# apply_state() draws it on the GUI thread, dropping results already superseded.
+def compute_state(P):
+    f = f_alpha(alpha_a, P)
+    return f, np.abs(f) <= 1, band_cache(P)
+
+def apply_state(state):
+    global f_vals, allowed_mask
+    f_vals, allowed_mask, edges = state
     line_lhs.set_ydata(f_vals)
+    np.multiply(allowed_mask, 64, out=allowed_rgba[0, :, 3], casting='unsafe')
+    fill_allowed_left.set_data(allowed_rgba)
     if stage[0] >= 2:
-        if fill_allowed_left:
-            fill_allowed_left.remove()
-        fill_allowed_left = ax_left.fill_between(alpha_a, -2, 6, where=allowed_mask,
-                                                 color='lime', alpha=0.25, label='Allowed')
+        fill_allowed_left.set_visible(True)
     # Update right plot
-    energies = compute_allowed_energies(P)
-    plot_bands(energies)
-    fig.canvas.draw_idle()
+    plot_bands(edges)
+    blit_plots()
+
+band_worker = LatestWorker(compute_state, apply_state, fig.canvas)
+
+def update_plot(P):
+    band_worker.submit(P)
+    blit_plots([ax_slider])     # the knob follows at once, the plots when the worker is done
 
 def next_stage(event):
-    global fill_allowed_left
     if stage[0] == 0:
         line_lhs.set_data(alpha_a, f_vals)
     elif stage[0] == 1:
         line_upper.set_visible(True)
         line_lower.set_visible(True)
     elif stage[0] == 2:
-        if fill_allowed_left:
-            fill_allowed_left.remove()
-        fill_allowed_left = ax_left.fill_between(alpha_a, -2, 6, where=allowed_mask,
-                                                 color='lime', alpha=0.25, label='Allowed')
-        ax_left.legend(loc='upper right')
+        fill_allowed_left.set_visible(True)
+        ax_left.legend(handles=[line_lhs, allowed_proxy], loc='upper right')
     stage[0] = min(stage[0] + 1, 2)
     fig.canvas.draw_idle()
 
 def prev_stage(event):
-    global fill_allowed_left
-    if stage[0] == 2 and fill_allowed_left:
-        fill_allowed_left.remove()
+    if stage[0] == 2:
+        fill_allowed_left.set_visible(False)
     if stage[0] == 1:
         line_upper.set_visible(False)
         line_lower.set_visible(False)
@@ -134,6 +183,12 @@ btn_prev.on_clicked(prev_stage)
 # --- Slider for P ---
 ax_slider = plt.axes([0.25, 0.1, 0.4, 0.03])
 slider_P = Slider(ax_slider, 'Barrier Strength P', 0, 1000, valinit=P_init)
+slider_P.drawon = False     # blitted with the plots instead of a full canvas redraw per event
+slider_moving = [slider_P.poly, slider_P.vline, slider_P._handle, slider_P.valtext]
+for artist in slider_moving:
+    artist.set_animated(True)
+animated[ax_slider] = slider_moving
 slider_P.on_changed(update_plot)
 
-plt.show()
+if __name__ == "__main__":
+    plt.show()
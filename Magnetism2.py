@@ -1,12 +1,18 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from fractions import Fraction
-import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from functools import lru_cache
+from matplotlib.collections import LineCollection
+from solidstate.clebsch_gordan import coupling_table
+from solidstate.terms import hund_ground_term, term_symbol
 
 plt.style.use('dark_background')
 
 def format_value(val):
+    return _format_fraction(float(val))
+
+@lru_cache(maxsize=4096)
+def _format_fraction(val):
     frac = Fraction(val).limit_denominator()
     if frac.denominator == 1:
         return f"{frac.numerator}"
@@ -14,8 +20,36 @@ def format_value(val):
         return f"{frac.numerator}/{frac.denominator}"
 
 class CouplingAnimation:
-    def __init__(self, root):
+    def __init__(self, root=None, max_labels=None):
+        # root=None draws on a plain figure with no Tk controls (headless export)
         self.root = root
+        if max_labels is not None:
+            self.max_labels = max_labels
+        if root is not None:
+            self.build_controls(root)
+
+        # Matplotlib figure
+        self.fig, self.ax = plt.subplots(figsize=(13,7))
+        self.fig.subplots_adjust(right=0.70)
+        if root is not None:
+            # The Tk backend is only loaded when a window is wanted
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.fig, master=root)
+            self.canvas.get_tk_widget().pack()
+        else:
+            self.canvas = self.fig.canvas
+
+        # Clebsch–Gordan matrix, in the column right of the scheme on the last step
+        self.cg_ax = self.fig.add_axes([0.75, 0.25, 0.23, 0.55], visible=False)
+
+        self.step = 0
+        self.built_for = None
+        self.term = None
+
+    def build_controls(self, root):
+        # tkinter is only imported when a window is wanted; the widget states
+        # elsewhere are Tk's plain strings ("normal", "disabled", "end")
+        import tkinter as tk
         self.root.title("Angular Momentum Coupling Animation")
         self.root.configure(bg="#1e1e1e")  # dark background
 
@@ -24,6 +58,10 @@ class CouplingAnimation:
         entry_style = {"bg":"#2d2d2d", "fg":"#ffffff", "insertbackground":"white",
                        "font":("Consolas", 12), "relief":"flat"}
 
+        tk.Label(root, text="Configuration (e.g. d5, 4f7) or L and S:", **label_style).pack(pady=(10,0))
+        self.config_entry = tk.Entry(root, **entry_style, width=10)
+        self.config_entry.pack(pady=5)
+
         tk.Label(root, text="Enter L:", **label_style).pack(pady=(10,0))
         self.L_entry = tk.Entry(root, **entry_style, width=10)
         self.L_entry.pack(pady=5)
@@ -43,42 +81,65 @@ class CouplingAnimation:
         self.next_button = tk.Button(root, text="Next", command=self.next_step, state=tk.DISABLED, **btn_style)
         self.next_button.pack(side=tk.RIGHT, padx=20, pady=10)
 
-        # Matplotlib figure
-        self.fig, self.ax = plt.subplots(figsize=(10,7))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=root)
-        self.canvas.get_tk_widget().pack()
-
-        self.step = 0
+    def set_configuration(self, config):
+        # Hund's-rules ground term of the configuration supplies L and S
+        L, S, J = hund_ground_term(config)
+        self.L, self.S = L, S
+        self.term = f"{config}: {term_symbol(L, S, J)}"
 
     def start(self):
+        config = self.config_entry.get().strip()
         try:
-            self.L = int(self.L_entry.get())
-            self.S = float(self.S_entry.get())
+            if config:
+                self.set_configuration(config)
+                for entry, value in ((self.L_entry, self.L), (self.S_entry, format_value(self.S))):
+                    entry.delete(0, "end")
+                    entry.insert(0, str(value))
+            else:
+                self.L = int(self.L_entry.get())
+                self.S = float(self.S_entry.get())
+                self.term = None
         except:
             return
 
         self.step = 0
-        self.prev_button.config(state=tk.DISABLED)
-        self.next_button.config(state=tk.NORMAL)
+        self.prev_button.config(state="disabled")
+        self.next_button.config(state="normal")
         self.update_plot()
 
     def next_step(self):
         self.step += 1
-        self.prev_button.config(state=tk.NORMAL)
-        if self.step >= 3:
-            self.next_button.config(state=tk.DISABLED)
+        self.prev_button.config(state="normal")
+        if self.step >= len(self.layers):
+            self.next_button.config(state="disabled")
         self.update_plot()
 
     def prev_step(self):
         self.step -= 1
-        self.next_button.config(state=tk.NORMAL)
+        self.next_button.config(state="normal")
         if self.step <= 0:
-            self.prev_button.config(state=tk.DISABLED)
+            self.prev_button.config(state="disabled")
         self.update_plot()
 
-    def update_plot(self):
+    # --- Layers: built once per (L, S), toggled by step ---
+    # Step 1 shows the (mL, mS) grid, step 2 the projection lines, step 3 the
+    # mJ pyramid and step 4 the Clebsch–Gordan matrix linking the two.  Each
+    # layer is one scatter / LineCollection plus its labels, so stepping only
+    # flips visibility.  Above max_labels a layer's labels would overlap into
+    # a solid block anyway and are left out, with a "+N more" note in their
+    # place; pass max_labels to raise the cap.
+    max_labels = 150
+
+    def hidden_note(self, n, y):
+        return self.ax.text(0.0, y, f"+{n} more labels (max_labels={self.max_labels})",
+                            transform=self.ax.transAxes, ha='left', va='center', color='gray', fontsize=9)
+
+    def build_layers(self):
         self.ax.clear()
-        self.ax.set_title(f"Coupling Scheme (L={self.L}, S={format_value(self.S)})", fontsize=14, color='cyan')
+        title = f"Coupling Scheme (L={self.L}, S={format_value(self.S)})"
+        if self.term:
+            title += f"  —  {self.term}"
+        self.ax.set_title(title, fontsize=14, color='cyan')
         theta = np.deg2rad(135)
 
         # Rectangle
@@ -88,13 +149,13 @@ class CouplingAnimation:
         X_rot = X*np.cos(theta) - Y*np.sin(theta)
         Y_rot = X*np.sin(theta) + Y*np.cos(theta)
 
-        if self.step >= 1:
-            for i in range(len(m_S_values)):
-                for j in range(len(m_L_values)):
-                    mL, mS = m_L_values[j], m_S_values[i]
-                    self.ax.plot(X_rot[i,j], Y_rot[i,j], 'yo', markersize=8, markeredgecolor='white')
-                    self.ax.text(X_rot[i,j], Y_rot[i,j]+0.25, f"{mL},{format_value(mS)}",
-                                 ha='center', va='bottom', fontsize=9, color='lightgreen')
+        grid = [self.ax.scatter(X_rot.ravel(), Y_rot.ravel(), s=64, c='y', edgecolors='white', zorder=2)]
+        if X.size <= self.max_labels:
+            grid += [self.ax.text(x, y+0.25, f"{format_value(mL)},{format_value(mS)}",
+                                  ha='center', va='bottom', fontsize=9, color='lightgreen')
+                     for x, y, mL, mS in zip(X_rot.ravel(), Y_rot.ravel(), X.ravel(), Y.ravel())]
+        else:
+            grid.append(self.hidden_note(X.size, 1.0))
 
         # Vertical lines
         J_values = np.arange(abs(self.L-self.S), self.L+self.S+1, 1)
@@ -102,36 +163,77 @@ class CouplingAnimation:
         y_offset = -self.S-12
         pyramid_bottom = y_offset - (len(J_values)-1)*2
 
-        if self.step >= 2:
-            for j in range(len(m_L_values)):
-                for i in range(len(m_S_values)):
-                    x_val = X_rot[i,j]
-                    self.ax.plot([x_val, x_val], [np.max(Y_rot)+1, pyramid_bottom-1], 'w--', alpha=0.4)
+        x_val = X_rot.T.ravel()
+        segments = np.empty((x_val.size, 2, 2))
+        segments[:, :, 0] = x_val[:, None]
+        segments[:, 0, 1] = np.max(Y_rot)+1
+        segments[:, 1, 1] = pyramid_bottom-1
+        lines = [self.ax.add_collection(LineCollection(segments, colors='w', linestyles='--', alpha=0.4))]
 
         # Pyramid
-        if self.step >= 3:
-            for row, J in enumerate(J_values):
-                for mj in mj_all:
-                    if -J <= mj <= J:
-                        x_rot = mj*np.cos(theta)
-                        y = y_offset - row*2
-                        self.ax.plot(x_rot, y, 'ro', markersize=8)
-                        self.ax.text(x_rot, y-0.4, f"{format_value(mj)}",
-                                     ha='center', va='top', color='orange', fontsize=9)
-                self.ax.text(np.min(X_rot)-2.0, y_offset - row*2, f"J={format_value(J)}",
-                             ha='right', va='center', color='lightblue', fontsize=11)
-
-            # m_J labels below pyramid
-            for mj in mj_all:
-                x_rot = mj*np.cos(theta)
-                self.ax.text(x_rot, pyramid_bottom-2, f"{format_value(mj)}",
-                             ha='center', va='top', color='lightgreen', fontsize=10)
-            self.ax.text(0, pyramid_bottom-3.5, "$m_J$", ha='center', color='cyan', fontsize=12)
-
+        row, col = np.nonzero(np.abs(mj_all)[None, :] <= J_values[:, None])
+        mj = mj_all[col]
+        x_rot = mj*np.cos(theta)
+        y = y_offset - row*2
+        pyramid = [self.ax.scatter(x_rot, y, s=64, c='r', zorder=2)]
+        hidden = 0
+        if mj.size <= self.max_labels:
+            pyramid += [self.ax.text(xp, yp-0.4, format_value(m), ha='center', va='top', color='orange', fontsize=9)
+                        for xp, yp, m in zip(x_rot, y, mj)]
+        else:
+            hidden += mj.size
+        for r, J in enumerate(J_values):
+            pyramid.append(self.ax.text(np.min(X_rot)-2.0, y_offset - r*2, f"J={format_value(J)}",
+                                        ha='right', va='center', color='lightblue', fontsize=11))
+
+        # m_J labels below pyramid
+        if mj_all.size <= self.max_labels:
+            pyramid += [self.ax.text(m*np.cos(theta), pyramid_bottom-2, format_value(m),
+                                     ha='center', va='top', color='lightgreen', fontsize=10)
+                        for m in mj_all]
+        else:
+            hidden += mj_all.size
+        if hidden:
+            pyramid.append(self.hidden_note(hidden, -0.04))
+        pyramid.append(self.ax.text(0, pyramid_bottom-3.5, "$m_J$", ha='center', color='cyan', fontsize=12))
+
+        # Clebsch–Gordan coefficients <mL, mS | J, mJ>; both bases sorted by mJ,
+        # so the matrix is block diagonal.  They only exist for S a multiple of
+        # 1/2; any other S still gets the scheme above, with a note here.
+        self.cg_ax.clear()
+        self.layers = [grid, lines, pyramid, [self.cg_ax]]
+        self.built_for = (self.L, self.S, self.term)
+        self.ax.autoscale_view()
         self.ax.axis('off')
+        if self.S < 0 or not float(2*self.S).is_integer():
+            self.cg_ax.axis('off')
+            self.cg_ax.text(0.5, 0.5, f"No Clebsch–Gordan table:\nS = {self.S:g} is not a multiple of 1/2",
+                            ha='center', va='center', color='orange', fontsize=10, transform=self.cg_ax.transAxes)
+            return
+        m1, m2, J_row, M_row, C = coupling_table(self.L, self.S)
+        self.cg_ax.axis('on')
+        self.cg_ax.imshow(C, cmap='coolwarm', vmin=-1, vmax=1, interpolation='nearest')
+        self.cg_ax.set_title(r"$\langle m_L, m_S | J, m_J \rangle$", fontsize=11, color='cyan')
+        if len(C) <= 12:
+            self.cg_ax.set_xticks(range(len(C)), [f"{format_value(a)},{format_value(b)}" for a, b in zip(m1, m2)],
+                                  rotation=90, fontsize=7)
+            self.cg_ax.set_yticks(range(len(C)), [f"{format_value(j)},{format_value(m)}" for j, m in zip(J_row, M_row)],
+                                  fontsize=7)
+        else:
+            self.cg_ax.set_xticks([])
+            self.cg_ax.set_yticks([])
+
+    def update_plot(self):
+        if self.built_for != (self.L, self.S, self.term):
+            self.build_layers()
+        for level, layer in enumerate(self.layers, start=1):
+            for artist in layer:
+                artist.set_visible(self.step >= level)
         self.canvas.draw()
 
 # Run GUI
-root = tk.Tk()
-app = CouplingAnimation(root)
-root.mainloop()
+if __name__ == "__main__":
+    import tkinter as tk
+    root = tk.Tk()
+    app = CouplingAnimation(root)
+    root.mainloop()
@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.widgets import Slider
+from solidstate import phonons
+from solidstate.phonons import chain_modes, displacement_amplitudes, finite_chain_modes
 
 # Parameters
 N = 20          # number of atoms
@@ -9,16 +11,35 @@ a = 1.0         # lattice spacing
 K = 1.0         # spring constant
 M1, M2 = 1.0, 1e-3   # initial masses
 
-# Atom positions
+# Atom positions; atoms 2l and 2l+1 (masses M1, M2) form unit cell l
 x = np.arange(N) * a
+cell = np.arange(N) // 2
+basis = np.arange(N) % 2
+
+# --- Finite chain: normal modes of these N atoms themselves ---
+# With finite_chain = True the animation shows the standing modes of the N
+# atoms between walls (`ends` "fixed" or "free") instead of Bloch waves, so
+# `defects` can swap single masses, e.g. {N//2: 0.2} for a light impurity
+# whose localized mode sits above the optical band.  Clicking the dispersion
+# picks the mode nearest the clicked ω; the discrete spectrum is marked at
+# its right edge.
+finite_chain = False
+ends = "fixed"
+defects = {}
+mode_current = [0]   # index of the finite-chain mode, ascending in ω
+
+def chain_masses():
+    m = np.where(basis == 0, M1, M2)
+    for j, mj in defects.items():
+        m[j] = mj
+    return m
+
+def finite_spectrum():
+    return finite_chain_modes(chain_masses(), K, ends, vectors=False)
 
 # Dispersion relation for diatomic lattice
 def omega_branches(k, M1, M2, K=K, a=a):
-    term = K*(M1+M2)/(M1*M2)
-    discr = term**2 - (4*K**2/(M1*M2)) * (np.sin(k*a/2)**2)
-    omega2_plus = term + np.sqrt(np.maximum(discr,0))
-    omega2_minus = term - np.sqrt(np.maximum(discr,0))
-    return np.sqrt(np.maximum(omega2_minus,0)), np.sqrt(np.maximum(omega2_plus,0))
+    return phonons.omega_branches(k, M1, M2, K, a)
 
 # k values
 k_vals = np.linspace(-np.pi/a, np.pi/a, 200)
@@ -37,7 +58,11 @@ plt.subplots_adjust(bottom=0.25)
 
 # Left subplot: lattice vibrations
 ax1 = axes[0]
-scat = ax1.scatter([], [], s=[], c=[])  # scatter with variable sizes and colors
+atom_colors = np.where(basis == 0, 'black', 'red')
+def atom_sizes():
+    return 100*chain_masses() if finite_chain else np.where(basis == 0, 100*M1, 100*M2)
+offsets = np.c_[x, np.zeros(N)]
+scat = ax1.scatter(x, np.zeros(N), s=atom_sizes(), c=atom_colors)  # sizes and colors set once
 ax1.set_xlim(-1, N*a)
 ax1.set_ylim(-1, 1)
 ax1.set_title("Diatomic lattice vibrations", fontsize=14)
@@ -55,12 +80,19 @@ ax2.set_xlabel("Wavevector k (units of π/2a)", fontsize=12)
 ax2.set_ylabel("Frequency ω", fontsize=12)
 ax2.set_xlim(-1.1, 1.1)
 ax2.set_ylim(0, max(omega_optical)+1)
+if finite_chain:
+    spectrum_marks, = ax2.plot(np.full(N, 1.05), finite_spectrum(), '_', color='blue',
+                               markersize=14, label="Finite chain")
+    ax2.set_ylim(0, max(max(omega_optical), spectrum_marks.get_ydata().max())+1)
 ax2.legend()
 ax2.grid(True, linestyle='--', alpha=0.6)
 
 # --- Mouse interaction: select branch ---
 def on_click(event):
-    if event.inaxes == ax2:
+    if event.inaxes == ax2 and finite_chain:
+        mode_current[0] = int(np.argmin(np.abs(spectrum_marks.get_ydata() - event.ydata)))
+        fig.canvas.draw_idle()
+    elif event.inaxes == ax2:
         k_new = event.xdata * np.pi / a
         if -np.pi/a <= k_new <= np.pi/a:
             k_current[0] = k_new
@@ -86,41 +118,59 @@ def update_slider(val):
     line_acoustic.set_ydata(omega_acoustic)
     line_optical.set_ydata(omega_optical)
     ax2.set_ylim(0, max(omega_optical)+1)
+    if finite_chain:
+        spectrum_marks.set_ydata(finite_spectrum())
+        ax2.set_ylim(0, max(max(omega_optical), spectrum_marks.get_ydata().max())+1)
+    scat.set_sizes(atom_sizes())
     fig.canvas.draw_idle()
 
 slider_M2.on_changed(update_slider)
 
+# --- Per-mode frame ring buffer ---
+# One temporal period of the selected (k, branch) mode is precomputed from
+# its eigenvector and replayed; it is rebuilt only when k, branch (or the
+# finite-chain mode) or M2 change.
+frame_dt = 0.1      # time between animation frames
+max_slots = 256     # cap on stored frames per period
+ring = {"key": None, "frames": None, "omega": 0.0}
+
+def mode_shape(k, branch):
+    if finite_chain:
+        # Only the selected mode is solved for; a standing wave, so U is real
+        omega, U = finite_chain_modes(chain_masses(), K, ends, indices=(mode_current[0],)*2)
+        U = U[:, 0]
+        return omega[0], U / U[np.argmax(np.abs(U))]
+    omega, e = chain_modes(k, [M1, M2], K, a)
+    s = 0 if branch == "acoustic" else 1
+    U = displacement_amplitudes(e[0], [M1, M2])[:, s]
+    U = U / U[np.argmax(np.abs(U))]     # largest amplitude real and equal to 1
+    return omega[0, s], U[basis] * np.exp(1j*k*cell*a)
+
+def period_frames(k, branch):
+    key = (mode_current[0], M2) if finite_chain else (k, branch, M2)
+    if ring["key"] != key:
+        w, C = mode_shape(k, branch)
+        n_slots = 1 if w == 0 else int(np.clip(np.ceil(2*np.pi/(w*frame_dt)), 1, max_slots))
+        phases = 2*np.pi*np.arange(n_slots)/n_slots
+        ring["frames"] = 0.3*np.imag(C[None, :]*np.exp(-1j*phases)[:, None])
+        ring["key"] = key
+        ring["omega"] = w
+    return ring
+
 # --- Animation update ---
 def update(frame):
     k = k_current[0]
-    w_ac, w_op = omega_branches(k, M1, M2)
-    t = frame / 10
-    y = np.zeros_like(x)
-    sizes = []
-    colors = []
-    if branch_current[0] == "acoustic":
-        for n in range(N):
-            y[n] = 0.3*np.sin(k*x[n] - w_ac*t)
-            sizes.append(100*M1 if n % 2 == 0 else 100*M2)
-            colors.append('black' if n % 2 == 0 else 'red')
-        dot.set_data([k*a/np.pi], [w_ac])
-    else:
-        for n in range(N):
-            if n % 2 == 0:
-                y[n] = 0.3*np.sin(k*x[n] - w_op*t)
-                sizes.append(100*M1)
-                colors.append('black')
-            else:
-                y[n] = -0.3*np.sin(k*x[n] - w_op*t)  # opposite phase
-                sizes.append(100*M2)
-                colors.append('red')
-        dot.set_data([k*a/np.pi], [w_op])
-    scat.set_offsets(np.c_[x, y])
-    scat.set_sizes(sizes)
-    scat.set_color(colors)
+    buf = period_frames(k, branch_current[0])
+    frames, w = buf["frames"], buf["omega"]
+    phase = (w*frame*frame_dt) % (2*np.pi)
+    slot = int(round(phase/(2*np.pi)*len(frames))) % len(frames)
+    offsets[:, 1] = frames[slot]
+    scat.set_offsets(offsets)
+    dot.set_data([1.05 if finite_chain else k*a/np.pi], [w])
     return scat, dot
 
 ani = animation.FuncAnimation(fig, update, frames=200, interval=50, blit=True)
 
 plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    plt.show()
\ No newline at end of file
@@ -1,6 +1,9 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from solidstate import phonons
+from solidstate.chain_md import ChainMD
+from solidstate.wave_view import WaveFieldView
 
 # Parameters
 N = 30          # number of atoms
@@ -8,19 +11,39 @@ a = 1.0         # lattice spacing
 K = 1.0         # spring constant
 M = 1.0         # mass
 
+# Lattice: 1 = the chain of N atoms; 2 = square, 3 = simple cubic lattice of
+# n_side atoms per edge, drawn as a colour map of one layer's displacement
+dim = 1
+n_side = 1000
+n_k = 201 if dim == 2 else 65      # k-mesh points per axis of the dispersion map
+
 # Atom positions
 x = np.arange(N) * a
 
-# Dispersion relation
+# Dispersion relation (k is a scalar on the chain, a vector (kx, ky[, kz]) otherwise)
 def omega(k):
-    return 2*np.sqrt(K/M)*np.abs(np.sin(k*a/2))
+    if dim == 1:
+        return phonons.omega(k, K, M, a)
+    return phonons.omega_lattice(k, K, M, a)
 
 # k values across Brillouin zone
 k_vals = np.linspace(-4*np.pi/a, 4*np.pi/a, 1000)
-omega_vals = omega(k_vals)
+omega_vals = omega(k_vals) if dim == 1 else None
 
 # Initial k
-k_current = [np.pi/4]
+k_current = [np.pi/4] if dim == 1 else [np.array([np.pi/4, np.pi/8, 0.0][:dim])]
+
+# --- Molecular dynamics: integrate the chain instead of replaying sin(kx - ωt) ---
+simulate = False                     # chain only
+alpha_fput, beta_fput = 0.0, 0.0     # FPUT cubic/quartic anharmonicity
+md = ChainMD(np.full(N, M), K, alpha_fput, beta_fput, dt=0.05, boundary="periodic")
+
+def launch_wave(k):
+    # u(x, 0) and v(x, 0) of the travelling wave 0.3 sin(kx - ωt)
+    md.set_state(0.3*np.sin(k*x), -0.3*omega(k)*np.cos(k*x))
+
+if dim == 1:
+    launch_wave(k_current[0])
 
 # Figure setup
 plt.rcParams["font.family"] = "Times New Roman"
@@ -28,51 +51,110 @@ fig, axes = plt.subplots(1, 2, figsize=(12, 5))
 
 # Left subplot: lattice vibrations
 ax1 = axes[0]
-points, = ax1.plot([], [], 'o-', color='blue')
-ax1.set_xlim(-1, N*a)
-ax1.set_ylim(-1, 1)
-ax1.set_title("Lattice vibrations", fontsize=14)
-ax1.set_xlabel("Atom index", fontsize=12)
-ax1.set_ylabel("Displacement", fontsize=12)
+if dim == 1:
+    points, = ax1.plot([], [], 'o-', color='blue')
+    ax1.set_xlim(-1, N*a)
+    ax1.set_ylim(-1, 1)
+    ax1.set_title("Lattice vibrations", fontsize=14)
+    ax1.set_xlabel("Atom index", fontsize=12)
+    ax1.set_ylabel("Displacement", fontsize=12)
+else:
+    # Displacement of the z = 0 layer, blue to red over -0.3 .. 0.3
+    wave_view = WaveFieldView(ax1, (n_side, n_side), a, interpolation="antialiased")
+    wave_view.set_wavevector(k_current[0])
+    # Open on a window of the lattice that resolves short waves; pan/zoom for the rest
+    ax1.set_xlim(-0.5*a, min(n_side, 100)*a - 0.5*a)
+    ax1.set_ylim(-0.5*a, min(n_side, 100)*a - 0.5*a)
+    ax1.set_title(f"Lattice vibrations ({n_side}×{n_side} atoms)", fontsize=14)
+    ax1.set_xlabel("x / a", fontsize=12)
+    ax1.set_ylabel("y / a", fontsize=12)
 
 # Right subplot: dispersion relation
 ax2 = axes[1]
-ax2.plot(k_vals*a/np.pi, omega_vals, color='black')
-ax1.grid(True)   # adds grid to subplot ax1
-ax2.grid(True)   # adds grid to subplot ax2
-dot, = ax2.plot([k_current[0]*a/np.pi], [omega(k_current[0])], 'ro', markersize=8)
-ax2.set_title("Dispersion relation ω(k)", fontsize=14)
-ax2.set_xlabel("Wavevector k (units of π/a)", fontsize=12)
-ax2.set_ylabel("Frequency ω", fontsize=12)
-ax2.set_xlim(-4, 4)
-ax2.set_ylim(0, 2*np.sqrt(K/M)+0.5)
+if dim == 1:
+    ax2.plot(k_vals*a/np.pi, omega_vals, color='black')
+    ax1.grid(True)   # adds grid to subplot ax1
+    ax2.grid(True)   # adds grid to subplot ax2
+    dot, = ax2.plot([k_current[0]*a/np.pi], [omega(k_current[0])], 'ro', markersize=8)
+    ax2.set_title("Dispersion relation ω(k)", fontsize=14)
+    ax2.set_xlabel("Wavevector k (units of π/a)", fontsize=12)
+    ax2.set_ylabel("Frequency ω", fontsize=12)
+    ax2.set_xlim(-4, 4)
+    ax2.set_ylim(0, 2*np.sqrt(K/M)+0.5)
+else:
+    # ω over the whole (kx, ky[, kz]) mesh in one call; a cubic lattice shows one kz plane
+    k_axis = np.linspace(-2*np.pi/a, 2*np.pi/a, n_k)
+    omega_mesh = omega(phonons.k_mesh(n_k, dim, 2*np.pi/a))
+    kz_index = [int(np.argmin(np.abs(k_axis - k_current[0][2])))] if dim == 3 else None
+    heatmap = ax2.imshow((omega_mesh if dim == 2 else omega_mesh[:, :, kz_index[0]]).T,
+                         origin="lower", extent=(-2, 2, -2, 2), cmap="viridis",
+                         vmin=0, vmax=omega_mesh.max())
+    fig.colorbar(heatmap, ax=ax2, label="Frequency ω")
+    dot, = ax2.plot([k_current[0][0]*a/np.pi], [k_current[0][1]*a/np.pi], 'ro', markersize=8)
+    ax2.set_title("Dispersion ω(k)" + (": scroll to change kz" if dim == 3 else ""), fontsize=14)
+    ax2.set_xlabel("kx (units of π/a)", fontsize=12)
+    ax2.set_ylabel("ky (units of π/a)", fontsize=12)
 
 # --- Mouse interaction ---
 def on_click(event):
     # Only respond if click is inside dispersion subplot
     if event.inaxes == ax2:
+        if dim > 1:
+            # (kx, ky) from the map; kz keeps its value
+            k_new = k_current[0].copy()
+            k_new[:2] = event.xdata*np.pi/a, event.ydata*np.pi/a
+            k_current[0] = k_new
+            wave_view.set_wavevector(k_new)
+            dot.set_data([event.xdata], [event.ydata])
+            fig.canvas.draw_idle()
+            return
         # Convert x back to k (units π/a → radians)
         k_new = event.xdata * np.pi / a
         # Clamp to Brillouin zone
         if -4*np.pi/a <= k_new <= 4*np.pi/a:
             k_current[0] = k_new
+            if simulate:
+                launch_wave(k_new)
             # Move dot immediately
             dot.set_data([event.xdata], [omega(k_new)])
             fig.canvas.draw_idle()
 
+def on_scroll(event):
+    # Cubic lattice: step through the kz planes of the dispersion mesh
+    if dim == 3 and event.inaxes == ax2:
+        kz_index[0] = int(np.clip(kz_index[0] + (1 if event.button == "up" else -1), 0, n_k - 1))
+        k_current[0][2] = k_axis[kz_index[0]]
+        heatmap.set_data(omega_mesh[:, :, kz_index[0]].T)
+        ax2.set_title(f"Dispersion ω(k) at kz = {k_current[0][2]*a/np.pi:.2f} π/a", fontsize=14)
+        wave_view.set_wavevector(k_current[0])
+        fig.canvas.draw_idle()
+
 fig.canvas.mpl_connect("button_press_event", on_click)
+fig.canvas.mpl_connect("scroll_event", on_scroll)
 
 # --- Animation update ---
 def update(frame):
     k = k_current[0]
     w = omega(k)
-    t = frame / 10
-    y = 0.3 * np.sin(k*x - w*t)
+    if dim > 1:
+        # Wave field advanced in place; nothing is allocated per frame
+        return wave_view.set_phase(w*frame/10), dot
+    if simulate:
+        y = frame   # displacements streamed from the integrator
+    else:
+        t = frame / 10
+        y = 0.3 * np.sin(k*x - w*t)
     points.set_data(x, y)
     dot.set_data([k*a/np.pi], [w])
     return points, dot
 
-ani = animation.FuncAnimation(fig, update, frames=200, interval=50, blit=True)
+if simulate and dim == 1:
+    # 2 steps of dt = 0.05 per frame keeps the 0.1 time units per frame used above
+    ani = animation.FuncAnimation(fig, update, frames=md.frames(steps_per_frame=2),
+                                  interval=50, blit=True, cache_frame_data=False)
+else:
+    ani = animation.FuncAnimation(fig, update, frames=200, interval=50, blit=True)
 
 plt.tight_layout()
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    plt.show()
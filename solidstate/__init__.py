@@ -0,0 +1 @@
+# Compute kernels shared by the animation scripts.
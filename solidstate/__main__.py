@@ -0,0 +1,47 @@
+import argparse
+import os
+import runpy
+import sys
+
+from .demos import REPO_DIR, SCRIPTS, script_path
+
+
+# --- Launcher ---
+#     python -m solidstate kp                   open one animation
+#     python -m solidstate export manifest.json render headlessly (see export.py)
+#     python -m solidstate bench -o out.json    time the kernels (see bench.py)
+#     python -m solidstate kp --profile --trace kp.json
+#                                               HUD of callback / frame timings (see profiling.py);
+#                                               SOLIDSTATE_PROFILE=1 or =<trace path> does the same
+# Only the selected script is run, so matplotlib and tkinter are imported
+# only when a GUI is actually asked for.
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["export"]:
+        from .export import main as export_main
+        return export_main(argv[1:])
+    if argv[:1] == ["bench"]:
+        from .bench import main as bench_main
+        return bench_main(argv[1:])
+    parser = argparse.ArgumentParser(
+        prog="python -m solidstate",
+        description="Open one of the animations; 'export' renders them headlessly, "
+                    "'bench' times the kernels.")
+    parser.add_argument("demo", choices=sorted(SCRIPTS))
+    parser.add_argument("--profile", action="store_true",
+                        help="time callbacks, animation updates and draws; show an on-canvas HUD")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="with --profile, write a Chrome trace (chrome://tracing, Perfetto) on exit")
+    args = parser.parse_args(argv)
+    env = os.environ.get("SOLIDSTATE_PROFILE", "")
+    if args.profile or env not in ("", "0"):
+        from . import profiling
+        trace = args.trace or (env if env not in ("", "0", "1") else None)
+        profiling.enable(trace)
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    runpy.run_path(script_path(args.demo), run_name="__main__")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
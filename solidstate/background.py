@@ -0,0 +1,78 @@
+import sys
+import threading
+import traceback
+
+from . import profiling
+
+
+# --- Latest-only background computation for GUI callbacks ---
+# submit() records the newest argument and returns at once; a daemon thread
+# computes only the most recent request, so a burst of slider events costs
+# one computation, not one per event.  Results are handed back on the GUI
+# thread by a canvas timer, and a result whose request has since been
+# superseded is dropped.  compute() must not touch artists; apply() may.
+class LatestWorker:
+
+    def __init__(self, compute, apply, canvas=None, poll_ms=15):
+        self._compute = profiling.timed(getattr(compute, "__qualname__", "compute"), "compute")(compute)
+        self._apply = profiling.timed(getattr(apply, "__qualname__", "apply"))(apply)
+        self._cond = threading.Condition()
+        self._submitted = 0         # generation of the newest request
+        self._applied = 0           # generation of the last applied result
+        self._pending = None        # (generation, arg) waiting for the worker
+        self._result = None         # (generation, value, error) waiting for the GUI
+        self._timer = None
+        if canvas is not None:
+            self._timer = canvas.new_timer(interval=poll_ms)
+            self._timer.add_callback(self.poll)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, arg):
+        with self._cond:
+            self._submitted += 1
+            self._pending = (self._submitted, arg)
+            self._cond.notify_all()
+        if self._timer is not None:
+            self._timer.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                gen, arg = self._pending
+                self._pending = None
+            value = error = None
+            try:
+                value = self._compute(arg)
+            except Exception:
+                error = traceback.format_exc()
+            with self._cond:
+                if gen == self._submitted:
+                    self._result = (gen, value, error)
+                    self._cond.notify_all()
+
+    def poll(self):
+        """Apply the newest result if one is ready (GUI thread)."""
+        with self._cond:
+            result, self._result = self._result, None
+            current = self._submitted
+        if result is not None and result[0] == current:
+            self._applied = result[0]
+            if result[2] is not None:
+                sys.stderr.write(result[2])
+            else:
+                self._apply(result[1])
+        if self._timer is not None and self._applied == current:
+            self._timer.stop()
+
+    def flush(self, timeout=None):
+        """Block until the newest request is computed and applied (headless use)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._applied == self._submitted
+                                       or (self._result is not None
+                                           and self._result[0] == self._submitted), timeout):
+                return False
+        self.poll()
+        return True
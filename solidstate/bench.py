@@ -0,0 +1,328 @@
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# --- Benchmark registry ---
+# A case is a factory: given one parameter value it does its setup untimed
+# and returns the zero-argument callable to time.  Every case runs on fixed
+# inputs and seeds so two result files are directly comparable.
+CASES = {}
+
+
+def benchmark(name, params):
+    def register(factory):
+        CASES[name] = (factory, tuple(params))
+        return factory
+    return register
+
+
+# --- Kronig–Penney ---
+_alpha_a = np.linspace(-8*np.pi, 8*np.pi, 20000)
+_alpha_a[_alpha_a == 0] = 1e-6
+
+
+@benchmark("kp.f_alpha", params=[1, 16, 256])
+def _f_alpha(n_P):
+    from .kronig_penney import f_alpha
+    P = np.linspace(0, 1000, n_P)[:, None]
+    return lambda: f_alpha(_alpha_a, P)
+
+
+@benchmark("kp.compute_allowed_energies", params=[1.0, 10.0, 100.0, 1000.0])
+def _allowed_energies(P):
+    from .kronig_penney import compute_allowed_energies
+    return lambda: compute_allowed_energies(_alpha_a, P)
+
+
+@benchmark("kp.transfer_matrix", params=["periodic", "binary", "continuous"])
+def _transfer_matrix(disorder):
+    # 10^4 cells of finite barriers over 512 energies
+    from .transfer_matrix import chain_matrix, kp_chain
+    E = np.linspace(0.5, 60.0, 512)
+    V, d = kp_chain(10000, 1.0, 0.2, 20.0, dV=2.0 if disorder == "continuous" else 0.0, seed=0)
+    if disorder == "binary":
+        V[1::2] = np.where(np.random.default_rng(0).random(10000) < 0.5, 20.0, 25.0)
+    return lambda: chain_matrix(E, V, d)
+
+
+# --- Adiabatic demagnetization ---
+def _salt():
+    from .paramagnet import Paramagnet
+    return Paramagnet(0.5, 2.0, 1.0, 1.0, 0.05)
+
+
+@benchmark("demag.entropy_curves", params=[1000, 10000, 100000])
+def _entropy_curves(n_T):
+    salt = _salt()
+    B = np.array([0.01, 0.1, 0.5, 1.0, 2.0, 3.0, 4.0])[:, None]
+    T = np.linspace(0.0, 3, n_T)
+    return lambda: salt.entropy(B, T)
+
+
+@benchmark("demag.mean_field_curves", params=[1000, 10000, 100000])
+def _mean_field_curves(n_T):
+    # The S-T curves of the ordered salt (T_c = 0.4), self-consistent at every point
+    from .paramagnet import MeanFieldSalt
+    salt = MeanFieldSalt(0.5, 2.0, 1.0, 1.0, 0.05, lam=0.4)
+    B = np.array([0.01, 0.1, 0.5, 1.0, 2.0, 3.0, 4.0])[:, None]
+    T = np.linspace(0.0, 3, n_T)
+    return lambda: salt.entropy(B, T)
+
+
+@benchmark("demag.cooling_path", params=[2.0, 2.5, 3.0])
+def _cooling_path(Ti):
+    # The T_f solve of update_plot: S(0.01, T_f) = S(B_b, T_i)
+    from .cooling import final_temperature
+    salt = _salt()
+    return lambda: final_temperature(salt, Ti, 3.0, 0.01)
+
+
+@benchmark("demag.cooling_sweep", params=[32, 316, 1000])
+def _cooling_sweep(side):
+    # Tf over a side x side (Ti, Bb) grid, in memory and in-process
+    from .cooling import cooling_sweep
+    salt = _salt()
+    Ti = np.linspace(0.5, 3.0, side)
+    Bb = np.linspace(0.1, 4.0, side)
+    return lambda: cooling_sweep(salt, Ti, Bb)
+
+
+@benchmark("demag.sample_spins", params=[8, 64, 256])
+def _sample_independent(side):
+    from .paramagnet import sample_spins
+    salt = _salt()
+    return lambda: sample_spins(salt, 2.0, 1.0, side*side)
+
+
+@benchmark("demag.sample_spins_ising", params=[8, 64, 256])
+def _sample_ising(side):
+    from .paramagnet import sample_spins
+    from .spin_lattice import IsingLattice
+    salt = _salt()
+    lattice = IsingLattice((side, side), 0.5, moment=1.0, seed=0)
+    return lambda: sample_spins(salt, 2.0, 1.0, side*side, lattice, n_sweeps=20)
+
+
+@benchmark("demag.spin_view", params=[64, 512, 2048])
+def _spin_view(side):
+    # One blitted update of the spin panel: set_spins plus the image draw
+    from .export import use_agg
+    use_agg()
+    import matplotlib.pyplot as plt
+    from .spin_view import SpinLatticeView
+    fig, ax = plt.subplots(figsize=(6, 6))
+    view = SpinLatticeView(ax, (side, side))
+    fig.canvas.draw()
+    rng = np.random.default_rng(0)
+    frames = [np.where(rng.random((side, side)) < 0.5, -1.0, 1.0) for _ in range(2)]
+    u = np.zeros((side, side))
+    frame = [0]
+
+    def step():
+        frame[0] += 1
+        view.update(u, frames[frame[0] % 2])
+    return step
+
+
+# --- Lattice vibrations ---
+@benchmark("phonons.omega_branches", params=[200, 10000, 1000000])
+def _omega_branches(n_k):
+    from .phonons import omega_branches
+    k = np.linspace(-np.pi, np.pi, n_k)
+    return lambda: omega_branches(k, 1.0, 2.0)
+
+
+def _frame_loop(demo, draw):
+    from .export import load_demo, use_agg
+    use_agg()
+    ns = load_demo(demo, {})["ns"]
+    frame = [0]
+
+    def step():
+        frame[0] += 1
+        ns["update"](frame[0])
+        if draw:
+            ns["fig"].canvas.draw()
+    return step
+
+
+@benchmark("lattice.update", params=["update", "draw"])
+def _lattice_update(mode):
+    return _frame_loop("lattice", mode == "draw")
+
+
+@benchmark("lattice.wave_field", params=[100, 1000])
+def _wave_field(side):
+    # One frame of the square-lattice wave view, without the draw
+    from .export import use_agg
+    use_agg()
+    import matplotlib.pyplot as plt
+    from .wave_view import WaveFieldView
+    fig, ax = plt.subplots()
+    view = WaveFieldView(ax, (side, side))
+    view.set_wavevector((np.pi/4, np.pi/8))
+    frame = [0]
+
+    def step():
+        frame[0] += 1
+        view.set_phase(0.1*frame[0])
+    return step
+
+
+@benchmark("phonons.finite_chain", params=[1000, 100000])
+def _finite_chain(n):
+    # The local mode of a light impurity in a random binary alloy, found by
+    # an ω window above the host band
+    from .phonons import finite_chain_modes
+    masses = np.where(np.random.default_rng(0).random(n) < 0.3, 2.0, 1.0)
+    masses[n // 2] = 0.3
+    return lambda: finite_chain_modes(masses, 1.0, "fixed", window=(2.05, 10.0))
+
+
+@benchmark("diatomic.update", params=["update", "draw"])
+def _diatomic_update(mode):
+    return _frame_loop("diatomic", mode == "draw")
+
+
+# --- Angular-momentum coupling ---
+@benchmark("coupling.update_plot", params=["1,0.5", "5,2.5", "20,3.5", "50,5"])
+def _coupling(LS):
+    from .export import load_demo, use_agg
+    use_agg()
+    app = load_demo("coupling", {})["app"]
+    L, S = LS.split(",")
+
+    def redraw():
+        # A fresh (L, S) every call, so layers are rebuilt, then all steps shown
+        app.L, app.S, app.step = int(L), float(S), 4
+        app.built_for = None
+        app.update_plot()
+    return redraw
+
+
+# --- Measurement ---
+def measure(fn, repeat=5, min_time=0.2):
+    """Median and best seconds per call, and peak traced memory of one call."""
+    fn()    # warm-up: caches, lazy imports, first draw
+    # Calls per timing so that all repeats together take about min_time
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time/repeat or number >= 1 << 20:
+            break
+        number *= 2
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - t0)/number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time": statistics.median(times), "best": min(times),
+            "number": number, "repeat": repeat, "peak_bytes": peak}
+
+
+def run(select=None, repeat=5, min_time=0.2, log=None):
+    """Run every case whose name contains one of ``select``; returns the results document."""
+    results = {}
+    for name, (factory, params) in CASES.items():
+        if select and not any(s in name for s in select):
+            continue
+        for param in params:
+            key = f"{name}[{param}]"
+            results[key] = measure(factory(param), repeat, min_time)
+            if log:
+                r = results[key]
+                log(f"{key:45s} {r['time']*1e3:10.3f} ms  {r['peak_bytes']/2**20:8.2f} MiB")
+    # Kernel-only runs never import matplotlib; record its version only if loaded
+    matplotlib = sys.modules.get("matplotlib")
+    return {"meta": {"python": platform.python_version(), "numpy": np.__version__,
+                     "matplotlib": matplotlib.__version__ if matplotlib else None,
+                     "machine": platform.machine(),
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "results": results}
+
+
+def compare(baseline, current, time_threshold=0.2, memory_threshold=0.2, log=None):
+    """Cases slower or hungrier than ``baseline`` by more than the relative thresholds."""
+    regressions = []
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        dt = new["time"]/old["time"] - 1
+        dm = new["peak_bytes"]/old["peak_bytes"] - 1 if old["peak_bytes"] else 0.0
+        flags = []
+        if dt > time_threshold:
+            flags.append("time")
+        if dm > memory_threshold:
+            flags.append("memory")
+        if flags:
+            regressions.append((key, flags, dt, dm))
+        if log:
+            log(f"{key:45s} time {dt:+7.1%}  memory {dm:+7.1%}  {' '.join(flags).upper()}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m solidstate bench",
+        description="Time the numerical kernels and redraw paths; optionally compare with a baseline.")
+    parser.add_argument("-k", dest="select", action="append",
+                        help="only cases whose name contains this (repeatable)")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="fail on regressions against this JSON")
+    parser.add_argument("--against", metavar="RESULTS",
+                        help="compare this JSON with the baseline instead of running")
+    parser.add_argument("--time-threshold", type=float, default=0.2,
+                        help="allowed relative slowdown (default 0.2 = 20%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.2,
+                        help="allowed relative growth of peak memory (default 0.2)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (_, params) in CASES.items():
+            print(name, list(params))
+        return 0
+    if args.against:
+        with open(args.against) as fh:
+            current = json.load(fh)
+    else:
+        current = run(args.select, args.repeat, log=print)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(current, fh, indent=1)
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        regressions = compare(baseline, current, args.time_threshold, args.memory_threshold, log=print)
+        if regressions:
+            print(f"{len(regressions)} regression(s)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import math
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+
+# --- Exact Clebsch–Gordan coefficients ---
+# Angular momenta are integers or half-integers; internally everything is
+# carried as twice its value (an int) so the arithmetic stays exact.  A
+# coefficient is sqrt of a rational, so the exact form returned is its
+# "signed square" sign(c) c², the convention of the usual printed tables.
+# Racah's formula:
+#     <j1 m1 j2 m2 | J M> = δ(M, m1+m2) sqrt[(2J+1) Δ(j1 j2 J)
+#         (j1+m1)! (j1-m1)! (j2+m2)! (j2-m2)! (J+M)! (J-M)!]
+#         Σ_k (-1)^k / [k! (j1+j2-J-k)! (j1-m1-k)! (j2+m2-k)! (J-j2+m1+k)! (J-j1-m2+k)!]
+#     Δ(a b c) = (a+b-c)! (a-b+c)! (-a+b+c)! / (a+b+c+1)!
+_factorials = [1]
+
+
+def _fact(n):
+    while len(_factorials) <= n:
+        _factorials.append(_factorials[-1]*len(_factorials))
+    return _factorials[n]
+
+
+def _twice(j):
+    two_j = Fraction(j)*2
+    if two_j.denominator != 1:
+        raise ValueError(f"{j} is not an integer or half-integer")
+    return int(two_j)
+
+
+def _triangle(a, b, c):
+    # a, b, c doubled; the sums must be even for the halved values to be integers
+    return abs(a - b) <= c <= a + b and (a + b + c) % 2 == 0
+
+
+@lru_cache(maxsize=1 << 16)
+def _cg_signed_square(j1, m1, j2, m2, J, M):
+    # All arguments doubled
+    if (m1 + m2 != M or not _triangle(j1, j2, J)
+            or abs(m1) > j1 or abs(m2) > j2 or abs(M) > J
+            or (j1 + m1) % 2 or (j2 + m2) % 2 or (J + M) % 2):
+        return Fraction(0)
+    if M < 0:
+        # <j1 m1 j2 m2 | J M> = (-1)^(j1+j2-J) <j1 -m1 j2 -m2 | J -M>
+        s = _cg_signed_square(j1, -m1, j2, -m2, J, -M)
+        return -s if (j1 + j2 - J) // 2 % 2 else s
+    h = lambda x: x // 2
+    A, B, C = h(j1 + j2 - J), h(j1 - m1), h(j2 + m2)
+    D, E = h(J - j2 + m1), h(J - j1 - m2)
+    numerator = ((J + 1)*_fact(A)*_fact(h(j1 - j2 + J))*_fact(h(-j1 + j2 + J))
+                 * _fact(B)*_fact(h(j1 + m1))*_fact(C)*_fact(h(j2 - m2))
+                 * _fact(h(J + M))*_fact(h(J - M)))
+    k_min = max(0, -D, -E)
+    k_max = min(A, B, C)
+    # Every term's denominator divides the product of the largest factorials
+    # it can contain, so the sum is carried as an integer over that product
+    # and only one Fraction (one gcd) is formed at the end.
+    common = (_fact(k_max)*_fact(A - k_min)*_fact(B - k_min)*_fact(C - k_min)
+              * _fact(D + k_max)*_fact(E + k_max))
+    total = 0
+    for k in range(k_min, k_max + 1):
+        term = common // (_fact(k)*_fact(A - k)*_fact(B - k)*_fact(C - k)*_fact(D + k)*_fact(E + k))
+        total += -term if k % 2 else term
+    square = Fraction(numerator*total*total, _fact(h(j1 + j2 + J) + 1)*common*common)
+    return square if total >= 0 else -square
+
+
+def _value(s):
+    return math.copysign(math.sqrt(abs(s)), s)
+
+
+def clebsch_gordan(j1, m1, j2, m2, J, M, exact=False):
+    """<j1 m1 j2 m2 | J M>; with ``exact=True`` the signed square as a Fraction."""
+    s = _cg_signed_square(_twice(j1), _twice(m1), _twice(j2), _twice(m2), _twice(J), _twice(M))
+    if exact:
+        return s
+    return _value(s)
+
+
+def wigner_3j(j1, j2, j3, m1, m2, m3, exact=False):
+    """Wigner 3j symbol (j1 j2 j3; m1 m2 m3); ``exact=True`` gives its signed square."""
+    # (j1 j2 j3; m1 m2 m3) = (-1)^(j1-j2-m3) <j1 m1 j2 m2 | j3 -m3> / sqrt(2 j3 + 1)
+    s = clebsch_gordan(j1, m1, j2, m2, j3, -Fraction(m3), exact=True) / (_twice(j3) + 1)
+    if (_twice(j1) - _twice(j2) - _twice(m3)) // 2 % 2:
+        s = -s
+    if exact:
+        return s
+    return _value(s)
+
+
+def coupling_table(j1, j2, exact=False):
+    """Full change of basis from |j1 m1, j2 m2> to |J M>.
+
+    Returns ``(m1, m2, J, M, C)``: the uncoupled basis as arrays ``m1, m2``
+    (length (2j1+1)(2j2+1)), the coupled basis as ``J, M`` (same length) and
+    ``C[a, b] = <m1[b] m2[b] | J[a] M[a]>``.  Both bases are sorted by total
+    M, so C is block diagonal.  With ``exact=True``, C is an object array of
+    signed squares (Fractions) instead of floats.
+    """
+    t1, t2 = _twice(j1), _twice(j2)
+    unc = sorted(((a + b, -a, a, b) for a in range(-t1, t1 + 1, 2) for b in range(-t2, t2 + 1, 2)))
+    cpl = sorted((M, J) for J in range(abs(t1 - t2), t1 + t2 + 1, 2) for M in range(-J, J + 1, 2))
+    n = len(unc)
+    C = np.zeros((n, n), dtype=object if exact else float)
+    # Only pairs with equal M couple: fill each M block
+    start_u = start_c = 0
+    while start_u < n:
+        M = unc[start_u][0]
+        stop_u = start_u
+        while stop_u < n and unc[stop_u][0] == M:
+            stop_u += 1
+        stop_c = start_c + (stop_u - start_u)
+        for a in range(start_c, stop_c):
+            J = cpl[a][1]
+            for b in range(start_u, stop_u):
+                s = _cg_signed_square(t1, unc[b][2], t2, unc[b][3], J, M)
+                C[a, b] = s if exact else _value(s)
+        start_u, start_c = stop_u, stop_c
+    if exact:
+        C[C == 0] = Fraction(0)
+    m1 = np.array([u[2] for u in unc]) / 2
+    m2 = np.array([u[3] for u in unc]) / 2
+    J = np.array([c[1] for c in cpl]) / 2
+    M = np.array([c[0] for c in cpl]) / 2
+    return m1, m2, J, M, C
@@ -0,0 +1,193 @@
+import os
+
+import numpy as np
+
+
+# --- Inverting S(T) at fixed field ---
+# At a fixed field the entropy of a salt rises monotonically with T
+# (dS/dT = C/T > 0), so T(S) is tabulated once per field on a geometric T
+# grid and read back by cubic Hermite interpolation of ln T against S, whose
+# slope d ln T / dS = 1/C is known exactly at the nodes.  Only points whose
+# interpolated T misses S by more than ``tol`` are refined, with Newton
+# steps on dS/dT = C/T kept inside the bracketing table cell.
+class EntropyTable:
+    """S(B, T) of ``salt`` at one field B on a geometric T grid, inverted by interpolation."""
+
+    def __init__(self, salt, B, T_min, T_max, n_points=4096):
+        self.salt = salt
+        self.B = float(B)
+        self.T = np.geomspace(T_min, T_max, n_points)
+        # Enforce monotonicity against rounding so np.interp sees a sorted abscissa
+        self.S = np.maximum.accumulate(salt.entropy(self.B, self.T))
+        self._log_T = np.log(self.T)
+        self._slope = 1 / salt.heat_capacity(self.B, self.T)
+
+    @classmethod
+    def covering(cls, salt, B, T_high, n_points=4096, span=1e-6):
+        """A table reaching every entropy S(B', T) with T <= ``T_high`` and any B'.
+
+        S is largest at zero field, so the grid is extended upwards until
+        S(B, T_max) >= S(0, T_high); it starts at ``span`` * T_high.
+        """
+        S_max = salt.entropy(0.0, T_high)
+        T_max = T_high
+        while salt.entropy(B, T_max) < S_max:
+            T_max *= 2
+        return cls(salt, B, span*T_high, T_max, n_points)
+
+    def temperature(self, S, tol=1e-12, max_iter=50):
+        """T with S(B, T) = ``S``; NaN where S lies outside the table."""
+        S = np.asarray(S, dtype=float)
+        outside = (S < self.S[0]) | (S > self.S[-1])
+        T = np.where(outside, np.nan, np.exp(self._interpolate(S)))
+        residual = S - self.salt.entropy(self.B, T)
+        idx = np.flatnonzero(np.abs(residual) > tol*max(self.S[-1], 1.0))
+        if idx.size:
+            T.flat[idx] = self._refine(S.flat[idx], T.flat[idx], tol, max_iter)
+        return T[()]
+
+    def _interpolate(self, S):
+        i = np.clip(np.searchsorted(self.S, S), 1, self.S.size - 1)
+        S0, S1 = self.S[i - 1], self.S[i]
+        width = S1 - S0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(width > 0, (S - S0) / width, 0.0)
+        y0, y1 = self._log_T[i - 1], self._log_T[i]
+        m0, m1 = self._slope[i - 1]*width, self._slope[i]*width
+        t2 = t*t
+        return (y0 + t*m0 + t2*(3*(y1 - y0) - 2*m0 - m1)
+                + t2*t*(2*(y0 - y1) + m0 + m1))
+
+    def _refine(self, S, T, tol, max_iter):
+        # Bracket [lo, hi] is the table cell holding S; h = S - S(T) falls through it
+        i = np.clip(np.searchsorted(self.S, S), 1, self.T.size - 1)
+        lo, hi = self.T[i - 1].copy(), self.T[i].copy()
+        T = np.clip(T, lo, hi)
+        scale = tol*max(self.S[-1], 1.0)
+        active = np.arange(S.size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(max_iter):
+                if active.size == 0:
+                    break
+                Ta, Sa = T[active], S[active]
+                h = Sa - self.salt.entropy(self.B, Ta)
+                below = h > 0
+                lo[active] = np.where(below, Ta, lo[active])
+                hi[active] = np.where(below, hi[active], Ta)
+                step = h * Ta / self.salt.heat_capacity(self.B, Ta)
+                T_new = Ta + step
+                inside = (T_new >= lo[active]) & (T_new <= hi[active])
+                T[active] = np.where(inside, T_new, 0.5*(lo[active] + hi[active]))
+                active = active[(np.abs(h) > scale) & (hi[active] - lo[active] > 1e-15*hi[active])]
+        return T
+
+
+def final_temperature(salt, Ti, Bb, B_residual=0.01, n_points=4096):
+    """T_f of magnetizing isothermally to ``Bb`` at ``Ti``, then demagnetizing
+    adiabatically to ``B_residual``; broadcasts over Ti and Bb."""
+    Ti, Bb = np.broadcast_arrays(np.asarray(Ti, dtype=float), np.asarray(Bb, dtype=float))
+    table = EntropyTable.covering(salt, B_residual, np.max(Ti, initial=0.0) or 1.0, n_points)
+    return table.temperature(salt.entropy(Bb, Ti))
+
+
+# --- (Ti, Bb) sweeps streamed to disk ---
+# The result T_f[r, i, j] for B_residual[r], Ti[i], Bb[j] is written into a
+# memory-mapped .npy as chunks of the flattened (Ti, Bb) grid complete, so a
+# sweep never has to fit in memory.  A sidecar ``<out>.progress.npz`` keeps
+# the axes, the salt and a done flag per chunk; it is replaced atomically
+# after the chunk's data has been flushed, so an interrupted sweep resumes
+# from the first chunk not yet recorded.
+def _salt_key(salt):
+    return np.array([salt.J, salt.gJ, salt.muB, salt.kB, salt.alpha, getattr(salt, "lam", 0.0)],
+                    dtype=float)
+
+
+def _sweep_chunk(args):
+    salt, Ti, Bb, tables, start, stop, tol = args
+    i, j = np.unravel_index(np.arange(start, stop), (Ti.size, Bb.size))
+    Sb = salt.entropy(Bb[j], Ti[i])
+    return start, np.stack([table.temperature(Sb, tol) for table in tables])
+
+
+def _load_progress(progress_path, meta):
+    try:
+        with np.load(progress_path) as data:
+            saved = {key: data[key] for key in data.files}
+    except (OSError, ValueError):
+        return None
+    if set(saved) != set(meta) | {"done"}:
+        return None
+    if not all(np.array_equal(saved[key], value) for key, value in meta.items()):
+        return None
+    return saved["done"]
+
+
+def _save_progress(progress_path, meta, done):
+    tmp = progress_path + ".tmp"
+    with open(tmp, "wb") as fh:
+        np.savez(fh, done=done, **meta)
+    os.replace(tmp, progress_path)
+
+
+def cooling_sweep(salt, Ti, Bb, B_residual=(0.01,), out=None, processes=None,
+                  chunk_size=1 << 16, n_points=4096, tol=1e-12, resume=True):
+    """T_f over the (Ti, Bb) grid for each residual field, shape ``(len(B_residual), len(Ti), len(Bb))``.
+
+    With ``out`` (a ``.npy`` path) the result is a memory map of that file,
+    filled chunk by chunk; an existing sweep with the same axes and salt is
+    resumed unless ``resume=False``.  With ``processes`` > 1 the chunks are
+    spread over a process pool, at most two per worker in flight.  NaN
+    marks final states below the tabulated temperature range.
+    """
+    Ti = np.asarray(Ti, dtype=float).ravel()
+    Bb = np.asarray(Bb, dtype=float).ravel()
+    B_residual = np.atleast_1d(np.asarray(B_residual, dtype=float))
+    shape = (B_residual.size, Ti.size, Bb.size)
+    n_chunks = -(-Ti.size*Bb.size // chunk_size)
+    T_high = np.max(Ti, initial=0.0) or 1.0
+    tables = [EntropyTable.covering(salt, B, T_high, n_points) for B in B_residual]
+
+    meta = {"Ti": Ti, "Bb": Bb, "B_residual": B_residual, "salt": _salt_key(salt),
+            "chunk_size": np.array(chunk_size), "n_points": np.array(n_points)}
+    if out is None:
+        result = np.empty(shape)
+        done = np.zeros(n_chunks, dtype=bool)
+        progress_path = None
+    else:
+        out = os.fspath(out)
+        progress_path = out + ".progress.npz"
+        done = _load_progress(progress_path, meta) if resume and os.path.exists(out) else None
+        if done is None:
+            result = np.lib.format.open_memmap(out, mode="w+", dtype=float, shape=shape)
+            done = np.zeros(n_chunks, dtype=bool)
+            _save_progress(progress_path, meta, done)
+        else:
+            result = np.load(out, mmap_mode="r+")
+    flat = result.reshape(B_residual.size, -1)
+
+    tasks = ((salt, Ti, Bb, tables, c*chunk_size, min((c + 1)*chunk_size, Ti.size*Bb.size), tol)
+             for c in np.flatnonzero(~done))
+
+    def store(start, Tf):
+        flat[:, start:start + Tf.shape[1]] = Tf
+        done[start // chunk_size] = True
+        if progress_path is not None:
+            result.flush()
+            _save_progress(progress_path, meta, done)
+
+    if processes is None or processes <= 1:
+        for task in tasks:
+            store(*_sweep_chunk(task))
+        return result
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = set()
+        for task in tasks:
+            pending.add(pool.submit(_sweep_chunk, task))
+            if len(pending) >= 2*processes:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    store(*future.result())
+        for future in pending:
+            store(*future.result())
+    return result
@@ -0,0 +1,18 @@
+import os
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Demo name -> animation script in the repository root
+SCRIPTS = {
+    "kp": "KP Mpdel.py",
+    "demag": "Adiabatic Demagnetization.py",
+    "lattice": "lattice vibrations.py",
+    "diatomic": "lattice vibration 2.py",
+    "coupling": "Magnetism2.py",
+}
+
+
+def script_path(name):
+    if name not in SCRIPTS:
+        raise ValueError(f"unknown demo {name!r}; expected one of {sorted(SCRIPTS)}")
+    return os.path.join(REPO_DIR, SCRIPTS[name])
@@ -0,0 +1,315 @@
+import argparse
+import itertools
+import json
+import os
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from .demos import REPO_DIR, script_path
+
+
+# --- Demo drivers ---
+# Each demo runs its script with the Agg backend and then drives the script's
+# own callbacks, so the exported frames are exactly what the GUI shows.  The
+# live namespace is reached through a function's __globals__ (run_path only
+# returns a copy).  setup() applies the job parameters once; frame() moves the
+# figure to frame i of n and returns it.
+def _namespace(g, name):
+    return g[name].__globals__
+
+
+def _kp_setup(g, params):
+    ns = _namespace(g, "update_plot")
+    for _ in range(int(params.get("stage", 0))):
+        ns["next_stage"](None)
+    P0 = float(params.get("P", ns["P_init"]))
+    return {"ns": ns, "P0": P0, "P1": float(params.get("P_stop", P0))}
+
+
+def _kp_frame(state, i, n):
+    ns = state["ns"]
+    t = i / (n - 1) if n > 1 else 0.0
+    ns["slider_P"].set_val(state["P0"] + (state["P1"] - state["P0"])*t)
+    ns["band_worker"].flush()   # the slider only queues P for the worker thread
+    return ns["fig"]
+
+
+def _demag_setup(g, params):
+    ns = _namespace(g, "update_plot")
+    # Through the text boxes, so their labels agree with the curves and the
+    # script's own submit handlers parse and apply the values
+    for name in ("Ti", "Bb"):
+        if name in params:
+            ns[f"text_box_{name}"].set_val(str(float(params[name])))
+    return {"ns": ns}
+
+
+def _demag_frame(state, i, n):
+    # Cycle a -> b -> c, as repeated presses of "Next" would
+    ns = state["ns"]
+    ns["current_state"] = i % len(ns["states"])
+    ns["update_plot"]()
+    return ns["fig"]
+
+
+def _lattice_setup(g, params):
+    ns = _namespace(g, "update")
+    ns["k_current"][0] = float(params.get("k", ns["k_current"][0]))
+    ns["simulate"] = bool(params.get("simulate", ns["simulate"]))
+    return {"ns": ns, "steps": None}
+
+
+def _lattice_frame(state, i, n):
+    ns = state["ns"]
+    if not ns["simulate"]:
+        ns["update"](i)
+        return ns["fig"]
+    # Frame i of the integrated chain is 2 i steps after launch; a chunk that
+    # starts mid-run fast-forwards once and then advances frame by frame.
+    md = ns["md"]
+    if state["steps"] is None or state["steps"] > 2*i:
+        ns["launch_wave"](ns["k_current"][0])
+        state["steps"] = 0
+    md.step(2*i - state["steps"])
+    state["steps"] = 2*i
+    ns["update"](md.u)
+    return ns["fig"]
+
+
+def _diatomic_setup(g, params):
+    ns = _namespace(g, "update")
+    ns["k_current"][0] = float(params.get("k", ns["k_current"][0]))
+    ns["branch_current"][0] = params.get("branch", ns["branch_current"][0])
+    if "M2" in params:
+        ns["slider_M2"].set_val(float(params["M2"]))
+    return {"ns": ns}
+
+
+def _diatomic_frame(state, i, n):
+    ns = state["ns"]
+    ns["update"](i)
+    return ns["fig"]
+
+
+def _coupling_setup(g, params):
+    app = g["CouplingAnimation"](None, params.get("max_labels"))
+    if "config" in params:
+        app.set_configuration(params["config"])
+    else:
+        app.L = int(params.get("L", 1))
+        app.S = float(params.get("S", 0.5))
+    return {"app": app}
+
+
+def _coupling_frame(state, i, n):
+    # Steps 0..4 of the coupling scheme, one per frame
+    app = state["app"]
+    app.step = i % 5
+    app.update_plot()
+    return app.fig
+
+
+DEMOS = {
+    "kp": (_kp_setup, _kp_frame),
+    "demag": (_demag_setup, _demag_frame),
+    "lattice": (_lattice_setup, _lattice_frame),
+    "diatomic": (_diatomic_setup, _diatomic_frame),
+    "coupling": (_coupling_setup, _coupling_frame),
+}
+
+
+# --- Worker side ---
+# A worker keeps the last loaded demo per name, so consecutive chunks of the
+# same job skip re-running the script and rebuilding its figure.  Scripts set
+# styles globally, so each one starts from rcdefaults() and its own rcParams
+# are restored whenever it is drawn again.
+_loaded = {}
+
+
+def use_agg():
+    """Switch this process to the Agg backend and make the scripts' imports resolvable."""
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+    matplotlib.use("Agg")
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+
+
+def load_demo(demo, params):
+    """Run a demo script headlessly (cached per process) and return its driver state."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+    key = json.dumps(params, sort_keys=True)
+    cached = _loaded.get(demo)
+    if cached is not None and cached["key"] == key:
+        matplotlib.rcParams.update(cached["rc"])
+        return cached["state"]
+    if cached is not None:
+        for num in cached["figures"]:
+            plt.close(num)
+    before = set(plt.get_fignums())
+    matplotlib.rcdefaults()
+    setup, _ = DEMOS[demo]
+    g = runpy.run_path(script_path(demo), run_name="solidstate_export")
+    state = setup(g, params)
+    _loaded[demo] = {"key": key, "state": state, "rc": matplotlib.rcParams.copy(),
+                     "figures": set(plt.get_fignums()) - before}
+    return state
+
+
+def _render_chunk(task):
+    use_agg()
+    demo, params, frames, n_frames, pattern, dpi = task
+    state = load_demo(demo, params)
+    draw = DEMOS[demo][1]
+    paths = []
+    for i in frames:
+        fig = draw(state, i, n_frames)
+        path = pattern.format(frame=i, **params)
+        fig.savefig(path, dpi=dpi)
+        paths.append(path)
+    return paths
+
+
+# --- Encoding ---
+def _write_gif(frames, path, fps):
+    from PIL import Image
+    images = [Image.open(p) for p in frames]
+    images[0].save(path, save_all=True, append_images=images[1:],
+                   duration=int(round(1000/fps)), loop=0)
+
+
+def _ffmpeg():
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("MP4 export needs ffmpeg on PATH; use a .gif or PNG output instead")
+    return ffmpeg
+
+
+def _write_mp4(frame_dir, path, fps):
+    ffmpeg = _ffmpeg()
+    # yuv420p needs even dimensions
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+                    "-i", os.path.join(frame_dir, "frame_%05d.png"),
+                    "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path],
+                   check=True)
+
+
+# --- Manifest ---
+# {"defaults": {"frames": 60, "fps": 20, "dpi": 100},
+#  "jobs": [{"demo": "kp", "output": "media/kp_stage{stage}.mp4",
+#            "params": {"P": 1, "P_stop": 200}, "sweep": {"stage": [0, 1, 2]}}]}
+# "sweep" expands to the cartesian product of its lists, merged into "params".
+# The output name is formatted with the parameters; a .mp4 or .gif output is
+# encoded from frames rendered to a scratch directory, anything else is a
+# PNG sequence and must contain a {frame} field, e.g. "out/lat_{k}_{frame:04d}.png".
+# Relative outputs are taken from the manifest's directory.
+def expand_jobs(manifest, base="."):
+    """Flatten a manifest into one dict per output file, outputs relative to ``base``."""
+    defaults = {"frames": 60, "fps": 20, "dpi": 100, "params": {}}
+    defaults.update(manifest.get("defaults", {}))
+    jobs = []
+    for entry in manifest["jobs"]:
+        job = dict(defaults, **entry)
+        if job["demo"] not in DEMOS:
+            raise ValueError(f"unknown demo {job['demo']!r}; expected one of {sorted(DEMOS)}")
+        sweep = job.pop("sweep", {})
+        names = list(sweep)
+        for values in itertools.product(*(sweep[name] for name in names)):
+            params = dict(job["params"], **dict(zip(names, values)))
+            output = os.path.join(base, job["output"])
+            kind = os.path.splitext(output)[1].lower()
+            if kind not in (".mp4", ".gif") and "{frame" not in output:
+                raise ValueError(f"PNG output {output!r} needs a {{frame}} field")
+            if kind in (".mp4", ".gif"):
+                output = output.format(**params)
+            jobs.append(dict(job, params=params, output=output, kind=kind))
+    return jobs
+
+
+def export(manifest, processes=None, chunk_size=None):
+    """Render every job of a manifest (dict or JSON path) and return the files written.
+
+    Frame ranges of all jobs are split into chunks and rendered across a
+    process pool; videos are encoded once all of their frames are done.
+    """
+    base = "."
+    if isinstance(manifest, (str, os.PathLike)):
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest) as fh:
+            manifest = json.load(fh)
+    jobs = expand_jobs(manifest, base)
+    if any(job["kind"] == ".mp4" for job in jobs):
+        _ffmpeg()   # fail before rendering anything
+    processes = processes or os.cpu_count() or 1
+    os.environ["MPLBACKEND"] = "Agg"
+
+    scratch = tempfile.mkdtemp(prefix="solidstate_export_")
+    try:
+        tasks, owners = [], []
+        for j, job in enumerate(jobs):
+            n = int(job["frames"])
+            if job["kind"] in (".mp4", ".gif"):
+                pattern = os.path.join(scratch, f"job{j}", "frame_{frame:05d}.png")
+            else:
+                pattern = job["output"]
+            os.makedirs(os.path.dirname(pattern.format(frame=0, **job["params"])) or ".",
+                        exist_ok=True)
+            # A few chunks per worker balances load without re-running scripts too often
+            size = chunk_size or max(1, -(-n // (2*processes)))
+            for start in range(0, n, size):
+                frames = range(start, min(start + size, n))
+                tasks.append((job["demo"], job["params"], frames, n, pattern, job["dpi"]))
+                owners.append(j)
+
+        rendered = [[] for _ in jobs]
+        if processes == 1:
+            results = map(_render_chunk, tasks)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(processes)
+            results = pool.map(_render_chunk, tasks)
+        try:
+            for j, paths in zip(owners, results):
+                rendered[j].extend(paths)
+        finally:
+            if processes != 1:
+                pool.shutdown()
+
+        written = []
+        for j, job in enumerate(jobs):
+            output = job["output"]
+            if job["kind"] == ".gif":
+                os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+                _write_gif(rendered[j], output, job["fps"])
+                written.append(output)
+            elif job["kind"] == ".mp4":
+                os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+                _write_mp4(os.path.join(scratch, f"job{j}"), output, job["fps"])
+                written.append(output)
+            else:
+                written.extend(rendered[j])
+        return written
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m solidstate export",
+        description="Render the animations headlessly from a parameter-sweep manifest.")
+    parser.add_argument("manifest", help="JSON manifest with 'defaults' and 'jobs'")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="frames per work unit (default: about two units per worker)")
+    args = parser.parse_args(argv)
+    for path in export(args.manifest, args.processes, args.chunk_size):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
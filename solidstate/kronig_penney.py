@@ -0,0 +1,250 @@
+import os
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+
+def f_alpha(alpha_a, P):
+    return P * np.sin(alpha_a) / alpha_a + np.cos(alpha_a)
+
+
+def df_alpha(alpha_a, P):
+    return P * (alpha_a*np.cos(alpha_a) - np.sin(alpha_a)) / alpha_a**2 - np.sin(alpha_a)
+
+
+def compute_allowed(alpha_a, P):
+    """Mask of allowed αa (|f| <= 1) on a sampled grid, and f itself."""
+    f_vals = f_alpha(alpha_a, P)
+    return np.abs(f_vals) <= 1, f_vals
+
+
+def compute_allowed_energies(alpha_a, P, a=1.0):
+    """Energies (αa/a)² of the allowed grid points."""
+    allowed, _ = compute_allowed(alpha_a, P)
+    return (alpha_a[allowed] / a)**2
+
+
+def _bracketed_newton(h, dh, lo, hi, tol, max_iter, x0=None):
+    # h(x, idx) and dh(x, idx) evaluate on the flat elements ``idx``; h must be
+    # positive at lo and non-positive at hi.  Newton steps that leave the
+    # bracket fall back to bisection, and converged elements drop out of the
+    # active set so late stragglers do not cost a full pass.
+    shape = lo.shape
+    lo = lo.ravel().copy()
+    hi = hi.ravel().copy()
+    x = 0.5*(lo + hi) if x0 is None else np.ravel(x0).copy()
+    scale = tol * np.max(hi, initial=1.0)
+    idx = np.arange(x.size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iter):
+            if idx.size == 0:
+                break
+            xi, loi, hii = x[idx], lo[idx], hi[idx]
+            hx = h(xi, idx)
+            above = hx > 0
+            loi = np.where(above, xi, loi)
+            hii = np.where(above, hii, xi)
+            x_newton = xi - hx / dh(xi, idx)
+            inside = (x_newton >= loi) & (x_newton <= hii)
+            x_new = np.where(inside, x_newton, 0.5*(loi + hii))
+            x_new = np.where(hx == 0, xi, x_new)
+            x[idx], lo[idx], hi[idx] = x_new, loi, hii
+            active = (np.abs(x_new - xi) > scale) & (hii - loi > scale) & (hx != 0)
+            idx = idx[active]
+    return x.reshape(shape)
+
+
+def _band_signs(n_bands):
+    n = np.arange(1, n_bands + 1)
+    return n, np.where(n % 2 == 1, 1.0, -1.0)
+
+
+# --- Band edges ---
+# For P >= 0 band n sits inside ((n-1)π, nπ]: its top is always αa = nπ, where
+# cos(αa) = ±1, and its bottom is the single root of f(αa) = (-1)^(n-1) in that
+# interval.  All bands (and all P values) are solved together with a bracketed
+# Newton iteration, so the cost per step is O(number of bands).
+def band_edges_alpha(P, n_bands=8, tol=1e-13, max_iter=100):
+    """Allowed αa intervals, shape ``np.shape(P) + (n_bands, 2)``."""
+    P = np.asarray(P, dtype=float)
+    if np.any(P < 0):
+        raise ValueError("band_edges_alpha requires P >= 0")
+    n, sign = _band_signs(n_bands)
+    shape = P.shape + (n_bands,)
+    Pb = np.broadcast_to(P[..., None], shape).ravel()
+    sb = np.broadcast_to(sign, shape).ravel()
+
+    hi = np.broadcast_to(n*np.pi, shape).astype(float)
+    lo = np.broadcast_to(np.maximum((n - 1)*np.pi, 1e-12), shape).astype(float)
+    upper = hi.copy()
+    # ±f(x) - 1 is positive at the bottom of each bracket and -2 at the top
+    x = _bracketed_newton(lambda x, i: sb[i]*f_alpha(x, Pb[i]) - 1,
+                          lambda x, i: sb[i]*df_alpha(x, Pb[i]),
+                          lo, hi, tol, max_iter)
+    x = np.where(P[..., None] == 0, (n - 1)*np.pi, x)
+    return np.stack([x, upper], axis=-1)
+
+
+def band_edges(P, n_bands=8, a=1.0):
+    """(E_low, E_high) of the first ``n_bands`` bands, with E = (α)^2."""
+    return (band_edges_alpha(P, n_bands) / a)**2
+
+
+# --- Precomputed table over a P range ---
+class BandTable:
+    """Band edges tabulated on a uniform P grid, linearly interpolated in between."""
+
+    def __init__(self, P_grid, edges, a=1.0):
+        self.P_grid = np.ascontiguousarray(P_grid, dtype=float)
+        self.edges = np.ascontiguousarray(edges, dtype=float)   # (n_P, n_bands, 2)
+        self.a = a
+
+    @classmethod
+    def build(cls, P_min=0.0, P_max=1000.0, n_points=4001, n_bands=8, a=1.0):
+        P_grid = np.linspace(P_min, P_max, n_points)
+        return cls(P_grid, band_edges(P_grid, n_bands, a), a)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["P_grid"], data["edges"], float(data["a"]))
+
+    @classmethod
+    def load_or_build(cls, path, **kwargs):
+        try:
+            table = cls.load(path)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            table = None
+        if table is None or not table.matches(**kwargs):
+            table = cls.build(**kwargs)
+            table.save(path)
+        return table
+
+    def matches(self, P_min=0.0, P_max=1000.0, n_points=4001, n_bands=8, a=1.0):
+        return (self.edges.shape[:2] == (n_points, n_bands) and self.a == a
+                and self.P_grid[0] == P_min and self.P_grid[-1] == P_max)
+
+    def save(self, path):
+        # Written under a per-process name and renamed into place, so parallel
+        # export workers never see each other's half-written archive
+        path = os.fspath(path)
+        if not path.endswith(".npz"):
+            path += ".npz"
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, P_grid=self.P_grid, edges=self.edges, a=self.a)
+        os.replace(tmp, path)
+
+    @property
+    def n_bands(self):
+        return self.edges.shape[1]
+
+    def covers(self, P):
+        return self.P_grid[0] <= P <= self.P_grid[-1]
+
+    def __call__(self, P):
+        P = np.clip(np.asarray(P, dtype=float), self.P_grid[0], self.P_grid[-1])
+        i = np.clip(np.searchsorted(self.P_grid, P) - 1, 0, len(self.P_grid) - 2)
+        t = (P - self.P_grid[i]) / (self.P_grid[i + 1] - self.P_grid[i])
+        t = t[..., None, None]
+        return (1 - t)*self.edges[i] + t*self.edges[i + 1]
+
+
+# --- LRU cache keyed on quantized P ---
+class BandCache:
+    """Bounded LRU cache of band edges, optionally backed by a :class:`BandTable`."""
+
+    def __init__(self, n_bands=8, a=1.0, dP=1e-3, maxsize=512, table=None):
+        self.n_bands = n_bands
+        self.a = a
+        self.dP = dP
+        self.maxsize = maxsize
+        self.table = table
+        self._entries = OrderedDict()
+
+    def __call__(self, P):
+        key = round(P / self.dP)
+        edges = self._entries.get(key)
+        if edges is not None:
+            self._entries.move_to_end(key)
+            return edges
+        P_q = key * self.dP
+        if (self.table is not None and self.table.covers(P_q) and self.table.a == self.a
+                and self.table.n_bands >= self.n_bands):
+            edges = self.table(P_q)[:self.n_bands]
+        else:
+            edges = band_edges(P_q, self.n_bands, self.a)
+        edges.flags.writeable = False
+        self._entries[key] = edges
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return edges
+
+    def clear(self):
+        self._entries.clear()
+
+
+# --- Reduced-zone dispersion E(k) ---
+# Inside band n, f(αa) falls monotonically from (-1)^(n-1) to (-1)^n, so each
+# cos(ka) has exactly one preimage αa between the band edges.
+def dispersion_alpha(P, k, n_bands=8, a=1.0, tol=1e-13, max_iter=100):
+    """αa solving cos(ka) = f(αa), shape ``np.shape(P) + (n_bands, len(k))``."""
+    P = np.asarray(P, dtype=float)
+    cos_ka = np.cos(np.asarray(k, dtype=float) * a)
+    edges = band_edges_alpha(P, n_bands, tol, max_iter)
+    _, sign = _band_signs(n_bands)
+    shape = P.shape + (n_bands, cos_ka.size)
+    Pb = np.broadcast_to(P[..., None, None], shape).ravel()
+    sb = np.broadcast_to(sign[:, None], shape).ravel()
+    cb = np.broadcast_to(cos_ka, shape).ravel()
+
+    lo = np.broadcast_to(np.maximum(edges[..., 0, None], 1e-12), shape)
+    hi = np.broadcast_to(edges[..., 1, None], shape)
+    # start from where cos(ka) sits between the two edge values ±1
+    x0 = lo + (hi - lo) * 0.5*(1 - sign[:, None]*cos_ka)
+    return _bracketed_newton(lambda x, i: sb[i]*(f_alpha(x, Pb[i]) - cb[i]),
+                             lambda x, i: sb[i]*df_alpha(x, Pb[i]),
+                             lo, hi, tol, max_iter, x0)
+
+
+def dispersion(P, k, n_bands=8, a=1.0):
+    """E(k) of every band for every P, shape ``np.shape(P) + (n_bands, len(k))``."""
+    return (dispersion_alpha(P, k, n_bands, a) / a)**2
+
+
+def effective_masses(P, n_bands=8, a=1.0):
+    """m*/m at the (lower, upper) edge of every band, in the script's E = α² units.
+
+    Near an edge f(αa) = ±1 the band is parabolic with
+    m*/m = -f(αa) f'(αa) / αa, independent of a.  At P = 0 no gaps open,
+    f' vanishes at every edge and the free-electron m*/m = 1 is returned.
+    """
+    x = band_edges_alpha(P, n_bands)
+    P = np.asarray(P, dtype=float)[..., None, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = -np.sign(f_alpha(x, P)) * df_alpha(x, P) / x
+    return np.where(P == 0, 1.0, m)
+
+
+def _dispersion_chunk(args):
+    P, k, n_bands, a = args
+    return dispersion(P, k, n_bands, a)
+
+
+def dispersion_sweep(P_values, k, n_bands=8, a=1.0, processes=None, chunk_size=64):
+    """:func:`dispersion` over a long 1D array of P, optionally split across processes.
+
+    With ``processes=None`` the sweep runs in-process, one broadcast call per
+    chunk of ``chunk_size`` P values to bound memory.
+    """
+    P_values = np.asarray(P_values, dtype=float).ravel()
+    k = np.asarray(k, dtype=float)
+    chunks = [(P_values[i:i + chunk_size], k, n_bands, a)
+              for i in range(0, P_values.size, chunk_size)]
+    if processes is None or processes <= 1 or len(chunks) <= 1:
+        results = map(_dispersion_chunk, chunks)
+        return np.concatenate(list(results)) if chunks else np.empty((0, n_bands, k.size))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return np.concatenate(list(pool.map(_dispersion_chunk, chunks)))
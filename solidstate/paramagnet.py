@@ -0,0 +1,221 @@
+import numpy as np
+
+
+# --- Ideal paramagnet entropy ---
+# S = kB (ln Z - <x>) with x_m = m gJ muB B / (kB T), evaluated with a
+# log-sum-exp so that neither Z nor the level populations can over/underflow.
+def entropy(B, T, mJ=(-0.5, 0.5), gJ=2.0, muB=1.0, kB=1.0, alpha=0.05):
+    """Spin + lattice (alpha T^3) entropy, broadcast over B and T; S = 0 for T <= 0."""
+    B, T = np.broadcast_arrays(np.asarray(B, dtype=float), np.asarray(T, dtype=float))
+    mJ = np.asarray(mJ, dtype=float)
+    warm = T > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.where(warm, gJ*muB*B / (kB*T), 0.0)[..., None] * mJ
+    x_max = np.max(x, axis=-1, keepdims=True)
+    w = np.exp(x - x_max)
+    Z = np.sum(w, axis=-1)
+    log_Z = x_max[..., 0] + np.log(Z)
+    mean_x = np.sum(w*x, axis=-1) / Z
+    S = np.where(warm, kB*(log_Z - mean_x) + alpha*T**3, 0.0)
+    return S[()]
+
+
+# --- Arbitrary-J paramagnet ---
+# With y = gJ muB B / (kB T) the 2J+1 Zeeman levels sum in closed form,
+#     Z = sinh(a y) / sinh(b y),   a = J + 1/2,  b = 1/2,
+# so <m> = a coth(a y) - b coth(b y) (= J B_J(J y)) and Var(m) = d<m>/dy.
+# Every quantity is O(1) per (B, T) point whatever the value of J.  Near
+# y = 0 the coth terms cancel, so a short Taylor series is used instead.
+def _log_sinh(u):
+    u = np.abs(u)
+    return u + np.log(-np.expm1(-2*u)) - np.log(2.0)
+
+
+def _inv_sinh2(u):
+    u = np.abs(u)
+    return 4*np.exp(-2*u) / np.expm1(-2*u)**2
+
+
+class Paramagnet:
+    """Non-interacting spin-J salt (e.g. J = 7/2 for Gd³⁺) plus an alpha T^3 lattice term."""
+
+    small_y = 1e-3
+
+    def __init__(self, J=0.5, gJ=2.0, muB=1.0, kB=1.0, alpha=0.05):
+        if J <= 0 or not float(2*J).is_integer():
+            raise ValueError("J must be a positive integer or half-integer")
+        self.J = J
+        self.gJ = gJ
+        self.muB = muB
+        self.kB = kB
+        self.alpha = alpha
+        self.mJ = np.arange(-J, J + 1)
+        # Cached constants of the Brillouin expressions
+        self._a = J + 0.5
+        self._b = 0.5
+        self._c1 = J*(J + 1) / 3
+        self._c3 = (self._a**4 - self._b**4) / 45
+        self._log_g = np.log(2*J + 1)
+
+    def _reduced_field(self, B, T):
+        # y = gJ muB B / (kB T) and a mask of T > 0, broadcast over B and T
+        B, T = np.broadcast_arrays(np.asarray(B, dtype=float), np.asarray(T, dtype=float))
+        warm = T > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = np.where(warm, self.gJ*self.muB*B / (self.kB*T), 0.0)
+        return y, warm, B, T
+
+    def _log_Z(self, y):
+        small = np.abs(y) < self.small_y
+        ys = np.where(small, self.small_y, y)
+        exact = _log_sinh(self._a*ys) - _log_sinh(self._b*ys)
+        series = self._log_g + 0.5*self._c1*y**2
+        return np.where(small, series, exact)
+
+    def _mean_m(self, y):
+        small = np.abs(y) < self.small_y
+        ys = np.where(small, self.small_y, y)
+        exact = self._a/np.tanh(self._a*ys) - self._b/np.tanh(self._b*ys)
+        series = self._c1*y - self._c3*y**3
+        return np.where(small, series, exact)
+
+    def _var_m(self, y):
+        small = np.abs(y) < self.small_y
+        ys = np.where(small, self.small_y, y)
+        exact = self._b**2*_inv_sinh2(self._b*ys) - self._a**2*_inv_sinh2(self._a*ys)
+        series = self._c1 - 3*self._c3*y**2
+        return np.where(small, series, exact)
+
+    def log_partition(self, B, T):
+        y, warm, _, _ = self._reduced_field(B, T)
+        return np.where(warm, self._log_Z(y), np.inf)[()]
+
+    def magnetization(self, B, T):
+        """Mean moment per spin, gJ muB <m>; saturated at T <= 0."""
+        y, warm, B, _ = self._reduced_field(B, T)
+        m = np.where(warm, self._mean_m(y), self.J*np.sign(B))
+        return (self.gJ*self.muB*m)[()]
+
+    def entropy(self, B, T):
+        """S = kB (ln Z - y <m>) + alpha T^3; S = 0 for T <= 0."""
+        y, warm, _, T = self._reduced_field(B, T)
+        S = self.kB*(self._log_Z(y) - y*self._mean_m(y)) + self.alpha*T**3
+        return np.where(warm, S, 0.0)[()]
+
+    def heat_capacity(self, B, T):
+        """C = kB y^2 Var(m) + 3 alpha T^3; C = 0 for T <= 0."""
+        y, warm, _, T = self._reduced_field(B, T)
+        C = self.kB*y**2*self._var_m(y) + 3*self.alpha*T**3
+        return np.where(warm, C, 0.0)[()]
+
+    def populations(self, B, T):
+        """Boltzmann weights of the mJ levels along the last axis."""
+        y, warm, B, _ = self._reduced_field(B, T)
+        x = y[..., None]*self.mJ
+        w = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        p = w / np.sum(w, axis=-1, keepdims=True)
+        ground = self.mJ == self.J
+        p_cold = np.where(B[..., None] < 0, ground[::-1], ground)
+        return np.where(warm[..., None], p, p_cold)
+
+    def sample(self, B, T, size, rng=None):
+        """Draw mJ for ``size`` independent spins in one inverse-CDF pass."""
+        rng = np.random.default_rng() if rng is None else rng
+        cdf = np.cumsum(self.populations(B, T))
+        u = rng.random(size)
+        idx = np.minimum(np.searchsorted(cdf, u*cdf[-1], side="right"), self.mJ.size - 1)
+        return self.mJ[idx]
+
+
+# --- Weiss molecular field ---
+# Each spin sees B + lam M, with M = gJ muB <m> the mean moment per spin, so
+#     <m> = J B_J(y),   y = y0 + kappa <m>,   y0 = gJ muB B / (kB T),
+#     kappa = lam (gJ muB)² / (kB T).
+# For B >= 0, f(m) = m - <m>(y0 + kappa m) is convex on [0, J] with f(J) > 0,
+# so Newton steps started from m = J fall monotonically onto the largest
+# root, the stable (and, at B = 0 below T_c, the spontaneous) solution;
+# B < 0 follows from m(-B) = -m(B).  All (B, T) points iterate together and
+# drop out of the active set as they converge; next to T_c, f' -> 0 and m is
+# only fixed to rounding / f', so a point also stops once its step stops
+# shrinking.  With the self-consistent y in place of y0, every single-spin
+# expression of Paramagnet still holds; only C picks up the response of the
+# field, 1 / (1 - kappa Var(m)).
+class MeanFieldSalt(Paramagnet):
+    """Spin-J salt with a Weiss molecular field ``lam`` M; ferromagnetic below T_c for lam > 0."""
+
+    def __init__(self, J=0.5, gJ=2.0, muB=1.0, kB=1.0, alpha=0.05, lam=0.0, tol=1e-13, max_iter=200):
+        super().__init__(J, gJ, muB, kB, alpha)
+        if lam < 0:
+            raise ValueError("lam must be non-negative (antiferromagnetic order needs two sublattices)")
+        self.lam = lam
+        self.tol = tol
+        self.max_iter = max_iter
+
+    @property
+    def ordering_temperature(self):
+        """Curie temperature T_c = lam (gJ muB)² J(J+1) / (3 kB); 0 without exchange."""
+        return self.lam*(self.gJ*self.muB)**2*self._c1 / self.kB
+
+    def _kappa(self, T, warm):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(warm, self.lam*(self.gJ*self.muB)**2 / (self.kB*T), 0.0)
+
+    def self_consistent(self, B, T):
+        """``(<m>, converged)`` of the Weiss equation, broadcast over B and T."""
+        y0, warm, B, T = Paramagnet._reduced_field(self, B, T)
+        kappa = self._kappa(T, warm)
+        y0 = np.abs(y0)
+        # T <= 0 keeps the saturated start, J sign(B) (J at B = 0 if lam > 0)
+        m = np.full(y0.shape, float(self.J))
+        if not self.lam:
+            m[~warm & (B == 0)] = 0.0
+        active = np.flatnonzero(warm)
+        last = np.full(active.size, np.inf)
+        y0f, kf, mf = y0.ravel(), kappa.ravel(), m.reshape(-1)
+        for _ in range(self.max_iter):
+            if active.size == 0:
+                break
+            ya, ka, ma = y0f[active], kf[active], mf[active]
+            y = ya + ka*ma
+            slope = 1 - ka*self._var_m(y)
+            # A slope rounded to <= 0 only occurs next to m = 0 at T_c: restart from there
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = np.where(slope > 0, (ma - self._mean_m(y))/slope, ma)
+            size = np.abs(step)
+            # Steps shrink all the way down; one that does not is rounding noise
+            done = (size <= self.tol*self.J) | (size >= last)
+            mf[active] = np.where(done, ma, np.maximum(ma - step, 0.0))
+            active, last = active[~done], size[~done]
+        converged = np.ones(m.shape, dtype=bool)
+        converged.flat[active] = False
+        return (np.where(B < 0, -m, m))[()], converged[()]
+
+    def _reduced_field(self, B, T):
+        m, _ = self.self_consistent(B, T)
+        y0, warm, B, T = Paramagnet._reduced_field(self, B, T)
+        return y0 + self._kappa(T, warm)*m, warm, B, T
+
+    def magnetization(self, B, T):
+        """Mean moment per spin, gJ muB <m>, including the spontaneous moment below T_c."""
+        return self.gJ*self.muB*self.self_consistent(B, T)[0]
+
+    def heat_capacity(self, B, T):
+        """C = kB y² Var(m) / (1 - kappa Var(m)) + 3 alpha T^3; C = 0 for T <= 0."""
+        y, warm, _, T = self._reduced_field(B, T)
+        var = self._var_m(y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            C = self.kB*y**2*var / (1 - self._kappa(T, warm)*var) + 3*self.alpha*T**3
+        return np.where(warm, C, 0.0)[()]
+
+
+def sample_spins(salt, B, T, size, lattice=None, n_sweeps=200):
+    """mJ of ``size`` spins of ``salt`` at (B, T).
+
+    Without a lattice the spins are independent draws; with one (an
+    :class:`~solidstate.spin_lattice.IsingLattice` of ``size`` sites) they
+    come from ``n_sweeps`` Metropolis sweeps continuing from its last state.
+    """
+    if lattice is None:
+        return salt.sample(B, T, size)
+    lattice.equilibrate(B, T, n_sweeps)
+    return salt.J * lattice.spins.ravel()
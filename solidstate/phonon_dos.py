@@ -0,0 +1,165 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+# --- Nearest-neighbour lattices in 1, 2 and 3 dimensions ---
+# Monatomic (square/cubic, spring K to 2d neighbours):
+#     ω² = (4K/M) Σ_d sin²(k_d a/2)
+# Diatomic (rock-salt-like scalar model, every atom tied to 2d atoms of the
+# other species, a = cell length):
+#     ω² = dK(1/M1 + 1/M2) ± dK sqrt((1/M1 + 1/M2)² - 4(1 - g)/(M1 M2)),
+#     g = (Σ_d cos(k_d a/2) / d)²
+# In one dimension these are exactly omega(k) and omega_branches(k) of the
+# lattice scripts.  k has the Cartesian components along its last axis.
+def omega_monatomic(k, K=1.0, M=1.0, a=1.0):
+    k = np.asarray(k, dtype=float)
+    return 2*np.sqrt(K/M*np.sum(np.sin(k*a/2)**2, axis=-1))
+
+
+def _diatomic_from_g(g, M1, M2, K, dim):
+    inv = 1/M1 + 1/M2
+    root = np.sqrt(np.maximum(inv**2 - 4*(1 - g)/(M1*M2), 0))
+    return (np.sqrt(np.maximum(dim*K*(inv - root), 0)),
+            np.sqrt(dim*K*(inv + root)))
+
+
+def omega_diatomic(k, M1, M2, K=1.0, a=1.0):
+    """(acoustic, optical) branches of the diatomic model."""
+    k = np.asarray(k, dtype=float)
+    dim = k.shape[-1]
+    g = (np.sum(np.cos(k*a/2), axis=-1) / dim)**2
+    return _diatomic_from_g(g, M1, M2, K, dim)
+
+
+# --- Streaming k-mesh histogram ---
+# Both models depend on k only through one mass-independent variable q in
+# [0, 1]: q = Σ sin²(k_d a/2) / d (monatomic) or q = g (diatomic).  Its
+# histogram over an n^dim mesh is accumulated in chunks of at most
+# ``chunk_size`` points: the sum over the trailing dimensions is tabulated
+# once and the leading indices are swept in blocks, so no chunk ever holds
+# more than chunk_size values.  The histogram is cached, and a DOS for new
+# masses is only a remapping of it.
+def _mesh_axis(n, period=np.pi):
+    # Midpoint mesh over one period of ka/2, centred on zero
+    return (np.arange(n) + 0.5)*period/n - period/2
+
+
+@lru_cache(maxsize=16)
+def mesh_histogram(kind, dim, n, n_fine=1 << 16, chunk_size=1 << 20):
+    """Fraction of mesh points in each of ``n_fine`` equal q-bins (read-only array)."""
+    if kind not in ("monatomic", "diatomic") or dim not in (1, 2, 3):
+        raise ValueError("kind must be 'monatomic' or 'diatomic' and dim 1, 2 or 3")
+    # sin² repeats every π in ka/2, but the diatomic g = (Σ cos(k_d a/2) / d)²
+    # only every 2π once d > 1: the axes with cos < 0 must be sampled too
+    if kind == "monatomic":
+        table = np.sin(_mesh_axis(n))**2/dim
+    else:
+        table = np.cos(_mesh_axis(n, 2*np.pi))/dim
+
+    # Tabulate the sum over as many trailing dimensions as fit in one chunk
+    inner_dims = dim
+    while inner_dims > 1 and n**inner_dims > chunk_size:
+        inner_dims -= 1
+    inner = np.zeros(1)
+    for _ in range(inner_dims):
+        inner = (inner[:, None] + table[None, :]).ravel()
+    outer = np.zeros(1)
+    for _ in range(dim - inner_dims):
+        outer = (outer[:, None] + table[None, :]).ravel()
+
+    counts = np.zeros(n_fine)
+    block = max(1, chunk_size // inner.size)
+    for start in range(0, outer.size, block):
+        q = (outer[start:start + block, None] + inner[None, :]).ravel()
+        if kind == "diatomic":
+            q *= q
+        idx = np.minimum((q*n_fine).astype(np.intp), n_fine - 1)
+        counts += np.bincount(idx, minlength=n_fine)
+    counts /= n**dim
+    counts.flags.writeable = False
+    return counts
+
+
+def phonon_dos(masses, dim=1, n=256, K=1.0, n_bins=400, n_fine=1 << 16, chunk_size=1 << 20):
+    """Density of states on ``n_bins`` ω bins from an n^dim mesh.
+
+    ``masses`` holds one mass (monatomic) or two (diatomic).  Returns the bin
+    centres and g(ω), normalised so that Σ g Δω is the number of branches.
+    """
+    masses = np.atleast_1d(np.asarray(masses, dtype=float))
+    kind = {1: "monatomic", 2: "diatomic"}.get(masses.size)
+    if kind is None:
+        raise ValueError("phonon_dos takes one or two masses")
+    weights = mesh_histogram(kind, dim, n, n_fine, chunk_size)
+    q = (np.arange(n_fine) + 0.5)/n_fine
+    if kind == "monatomic":
+        branches = [2*np.sqrt(K*dim*q/masses[0])]
+        omega_max = 2*np.sqrt(K*dim/masses[0])
+    else:
+        branches = list(_diatomic_from_g(q, masses[0], masses[1], K, dim))
+        omega_max = np.sqrt(2*dim*K*(1/masses[0] + 1/masses[1]))
+
+    edges = np.linspace(0, omega_max, n_bins + 1)
+    g = np.zeros(n_bins)
+    for w in branches:
+        idx = np.minimum((w/omega_max*n_bins).astype(np.intp), n_bins - 1)
+        g += np.bincount(idx, weights=weights, minlength=n_bins)
+    width = edges[1] - edges[0]
+    return 0.5*(edges[1:] + edges[:-1]), g/width
+
+
+# --- Heat capacity (kB = ħ = 1, per unit cell) ---
+def _einstein_function(x):
+    # x² e^x / (e^x - 1)² = (x/2 / sinh(x/2))², with the x -> 0 limit of 1
+    half = np.asarray(x, dtype=float)/2
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        c = (half/np.sinh(half))**2
+    return np.where(half == 0, 1.0, np.nan_to_num(c))
+
+
+def heat_capacity(omega, g, T):
+    """C_V(T) = Σ g(ω) Δω c_E(ω/T) from a binned DOS, vectorised over T."""
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    d_omega = omega[1] - omega[0]
+    with np.errstate(divide="ignore"):
+        x = omega[None, :] / T[:, None]
+    return (_einstein_function(x) @ (g*d_omega)).reshape(np.shape(T))
+
+
+def einstein_heat_capacity(T, omega_E, n_modes=1):
+    T = np.asarray(T, dtype=float)
+    with np.errstate(divide="ignore"):
+        return n_modes*_einstein_function(omega_E / T)
+
+
+_gl_x, _gl_w = np.polynomial.legendre.leggauss(200)
+
+
+def debye_heat_capacity(T, omega_D, dim=3, n_modes=1):
+    """Debye model with g(ω) ∝ ω^(dim-1) up to omega_D, n_modes modes per cell."""
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    # ∫_0^1 dim y^(dim-1) c_E(y omega_D / T) dy by Gauss-Legendre on [0, 1]
+    y = 0.5*(_gl_x + 1)
+    with np.errstate(divide="ignore"):
+        x = y[None, :]*omega_D/T[:, None]
+    integrand = dim*y**(dim - 1)*_einstein_function(x)
+    return n_modes*(integrand @ (0.5*_gl_w))
+
+
+def _fit(model, T, C, bounds):
+    T = np.asarray(T, dtype=float)
+    C = np.asarray(C, dtype=float)
+    from scipy.optimize import minimize_scalar
+    res = minimize_scalar(lambda w: np.sum((model(T, w) - C)**2), bounds=bounds, method="bounded")
+    return res.x
+
+
+def fit_debye(T, C, dim=3, n_modes=1, bounds=(1e-3, 100.0)):
+    """Least-squares Debye frequency for a C_V(T) curve."""
+    return _fit(lambda T, w: debye_heat_capacity(T, w, dim, n_modes), T, C, bounds)
+
+
+def fit_einstein(T, C, n_modes=1, bounds=(1e-3, 100.0)):
+    """Least-squares Einstein frequency for a C_V(T) curve."""
+    return _fit(lambda T, w: einstein_heat_capacity(T, w, n_modes), T, C, bounds)
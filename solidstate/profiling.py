@@ -0,0 +1,217 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+# --- Opt-in frame-time and callback-latency instrumentation ---
+# enable() installs hooks before a script builds its figure:
+#   * every callback a script registers with matplotlib (sliders, buttons,
+#     text boxes, mpl_connect) or Tk (button commands) is wrapped at
+#     registration time and timed under the script's own function name;
+#   * every FuncAnimation update function is timed as "animation:<name>";
+#   * Figure.draw and the blit flush of animations are timed as draws.
+# Spans nest: a draw that happens inside a callback (a synchronous
+# canvas.draw()) is charged to that callback's draw time, the rest is its
+# compute time.  Nothing is patched until enable() is called, so a disabled
+# run pays nothing.
+_enabled = False
+_trace_path = None
+_hud = True
+_history = 512              # samples per name kept for the percentiles
+_max_events = 1_000_000     # bound on the Chrome trace buffer
+
+_samples = defaultdict(lambda: deque(maxlen=_history))   # name -> (total, compute, draw) in s
+_events = deque(maxlen=_max_events)
+_local = threading.local()
+_t0 = time.perf_counter_ns()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "start", "draw_inside")
+
+    def __init__(self, name, cat):
+        self.name = name
+        self.cat = cat
+        self.start = time.perf_counter_ns()
+        self.draw_inside = 0
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _begin(name, cat):
+    span = _Span(name, cat)
+    _stack().append(span)
+    return span
+
+
+def _end(span):
+    end = time.perf_counter_ns()
+    stack = _stack()
+    stack.pop()
+    dur = end - span.start
+    parent = stack[-1] if stack else None
+    if span.cat == "draw":
+        # A draw inside a draw is already part of the outer one
+        if parent is not None and parent.cat != "draw":
+            parent.draw_inside += dur
+        draw = dur
+    else:
+        draw = span.draw_inside
+    if parent is None or parent.cat != "draw":
+        _samples[span.name].append((dur*1e-9, (dur - draw)*1e-9 if span.cat != "draw" else 0.0, draw*1e-9))
+    _events.append({"name": span.name, "cat": span.cat, "ph": "X", "pid": os.getpid(),
+                    "tid": threading.get_ident(), "ts": (span.start - _t0)/1e3, "dur": dur/1e3})
+
+
+def timed(name, cat="callback"):
+    """Decorator timing a function under ``name`` while instrumentation is on."""
+    def wrap(func):
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            span = _begin(name, cat)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _end(span)
+        wrapper.__wrapped__ = func
+        return wrapper
+    return wrap
+
+
+def _user_function(func):
+    # Widgets register `lambda val: func(val)`; look through it to the script's function
+    if getattr(func, "__name__", "") == "<lambda>":
+        for cell in getattr(func, "__closure__", None) or ():
+            if callable(cell.cell_contents):
+                return cell.cell_contents
+    return func
+
+
+def _is_library(func):
+    module = getattr(func, "__module__", None) or ""
+    return module.split(".")[0] in ("matplotlib", "tkinter", "PIL")
+
+
+def _wrap_callback(func, prefix=""):
+    target = _user_function(func)
+    if _is_library(target) or getattr(func, "__wrapped__", None) is not None:
+        return func
+    return timed(prefix + getattr(target, "__qualname__", repr(target)))(func)
+
+
+# --- Summary ---
+def stats():
+    """Per-name count and percentiles (ms) of total, mean compute and draw time."""
+    out = {}
+    for name, samples in list(_samples.items()):
+        a = np.array(samples)
+        p50, p95, p99 = np.percentile(a[:, 0], [50, 95, 99])*1e3
+        out[name] = {"count": len(a), "p50": p50, "p95": p95, "p99": p99,
+                     "compute": a[:, 1].mean()*1e3, "draw": a[:, 2].mean()*1e3,
+                     "total": a[:, 0].sum()}
+    return out
+
+
+def hud_text(rows=8):
+    lines = [f"{'':26s} {'n':>5s} {'p50':>7s} {'p95':>7s} {'p99':>7s} {'compute':>8s} {'draw':>7s}  ms"]
+    ranked = sorted(stats().items(), key=lambda item: -item[1]["total"])[:rows]
+    for name, s in ranked:
+        lines.append(f"{name[-26:]:26s} {s['count']:5d} {s['p50']:7.2f} {s['p95']:7.2f} "
+                     f"{s['p99']:7.2f} {s['compute']:8.2f} {s['draw']:7.2f}")
+    return "\n".join(lines)
+
+
+def dump_trace(path=None):
+    """Write the recorded spans in Chrome trace format (chrome://tracing, Perfetto)."""
+    path = path or _trace_path
+    if not path:
+        return None
+    with open(path, "w") as fh:
+        json.dump({"traceEvents": list(_events), "displayTimeUnit": "ms"}, fh)
+    return path
+
+
+# --- Hooks ---
+def _install():
+    import matplotlib.animation as animation
+    import matplotlib.cbook as cbook
+    from matplotlib.figure import Figure
+
+    connect = cbook.CallbackRegistry.connect
+
+    def connect_timed(self, signal, func):
+        return connect(self, signal, _wrap_callback(func))
+    cbook.CallbackRegistry.connect = connect_timed
+
+    func_animation_init = animation.FuncAnimation.__init__
+
+    def func_animation_timed(self, fig, func, *args, **kwargs):
+        func_animation_init(self, fig, _wrap_callback(func, "animation:"), *args, **kwargs)
+    animation.FuncAnimation.__init__ = func_animation_timed
+
+    post_draw = animation.Animation._post_draw
+
+    def post_draw_timed(self, framedata, blit):
+        span = _begin("blit" if blit and self._drawn_artists else "draw_idle", "draw")
+        try:
+            post_draw(self, framedata, blit)
+        finally:
+            _end(span)
+    animation.Animation._post_draw = post_draw_timed
+
+    figure_draw = Figure.draw
+
+    def figure_draw_timed(self, renderer):
+        if _hud:
+            _refresh_hud(self)
+        span = _begin("draw", "draw")
+        try:
+            figure_draw(self, renderer)
+        finally:
+            _end(span)
+    Figure.draw = figure_draw_timed
+
+    try:
+        import tkinter
+    except ImportError:
+        return
+    call_wrapper_init = tkinter.CallWrapper.__init__
+
+    def call_wrapper_timed(self, func, subst, widget):
+        call_wrapper_init(self, _wrap_callback(func), subst, widget)
+    tkinter.CallWrapper.__init__ = call_wrapper_timed
+
+
+def _refresh_hud(fig):
+    text = getattr(fig, "_solidstate_hud", None)
+    if text is None:
+        text = fig._solidstate_hud = fig.text(
+            0.005, 0.995, "", ha="left", va="top", family="monospace", fontsize=7,
+            color="lime", zorder=1e6, bbox=dict(facecolor="black", alpha=0.6, lw=0))
+        # Blitted animations rarely redraw the whole figure; refresh once a second
+        timer = fig.canvas.new_timer(interval=1000)
+        timer.add_callback(fig.canvas.draw_idle)
+        timer.start()
+        fig._solidstate_hud_timer = timer
+    text.set_text(hud_text())
+
+
+def enable(trace_path=None, hud=True):
+    """Turn instrumentation on; call before the script builds its figure."""
+    global _enabled, _trace_path, _hud
+    _trace_path = trace_path
+    _hud = hud
+    if not _enabled:
+        _enabled = True
+        _install()
+        atexit.register(dump_trace)
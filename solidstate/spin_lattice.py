@@ -0,0 +1,185 @@
+import numpy as np
+
+
+# --- Checkerboard Metropolis Monte Carlo ---
+# Sites are split into the two colours of a checkerboard.  No site has a
+# neighbour of its own colour, so every site of one colour can be updated at
+# once from the current neighbour sums; one sweep is one update per colour.
+# Energies are in units of kB, with
+#     E = -J Σ<ij> S_i·S_j - moment B Σ_i S_i^z
+# on a periodic lattice, where S is ±1 (Ising) or a unit vector (Heisenberg).
+#
+# Each colour is stored compactly as a (rows, cols/2) array: row i of colour c
+# holds the sites at columns 2m + (i + c) % 2.  The vertical neighbours of a
+# site then sit in the same column m of the other colour, and the horizontal
+# ones at m and m ± 1 depending on the row parity.
+class _CheckerboardLattice:
+
+    def __init__(self, shape, J=1.0, B=0.0, T=1.0, moment=1.0, seed=None):
+        shape = (shape, shape) if np.isscalar(shape) else tuple(shape)
+        if len(shape) != 2 or shape[0] % 2 or shape[1] % 2:
+            raise ValueError("lattice shape must be two even side lengths")
+        self.shape = shape
+        self.J = J
+        self.B = B
+        self.T = T
+        self.moment = moment
+        self.rng = np.random.default_rng(seed)
+        self._half_shape = (shape[0], shape[1] // 2)
+
+    @property
+    def n_sites(self):
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def spins(self):
+        s = np.empty(self.shape + self._halves[0].shape[2:], dtype=self._halves[0].dtype)
+        for c, half in enumerate(self._halves):
+            for r in (0, 1):
+                s[r::2, (r + c) % 2::2] = half[r::2]
+        return s
+
+    @spins.setter
+    def spins(self, s):
+        s = np.asarray(s, dtype=self._dtype).reshape(self.shape + self._site_shape)
+        self._halves = []
+        for c in (0, 1):
+            half = np.empty(self._half_shape + self._site_shape, dtype=self._dtype)
+            for r in (0, 1):
+                half[r::2] = s[r::2, (r + c) % 2::2]
+            self._halves.append(half)
+        self._nn = np.empty_like(self._halves[0])
+
+    def _neighbour_sum(self, colour):
+        o = self._halves[1 - colour]
+        out = self._nn
+        out[1:] = o[:-1]
+        out[0] = o[-1]
+        out[:-1] += o[1:]
+        out[-1] += o[0]
+        out += o
+        for r in (0, 1):
+            rows_out, rows_o = out[r::2], o[r::2]
+            if r == colour:
+                rows_out[:, 1:] += rows_o[:, :-1]
+                rows_out[:, 0] += rows_o[:, -1]
+            else:
+                rows_out[:, :-1] += rows_o[:, 1:]
+                rows_out[:, -1] += rows_o[:, 0]
+        return out
+
+    def sweep(self, n_sweeps=1):
+        for _ in range(n_sweeps):
+            self._update(0)
+            self._update(1)
+        return self
+
+    def equilibrate(self, B, T, n_sweeps):
+        self.B = B
+        self.T = T
+        return self.sweep(n_sweeps)
+
+
+class IsingLattice(_CheckerboardLattice):
+    """Ising spins s = ±1 on a periodic 2D lattice, stored as int8."""
+
+    _dtype = np.int8
+    _site_shape = ()
+
+    def __init__(self, shape, J=1.0, B=0.0, T=1.0, moment=1.0, seed=None, spins=None):
+        super().__init__(shape, J, B, T, moment, seed)
+        if spins is None:
+            spins = self.rng.choice(np.array([-1, 1], dtype=np.int8), size=self.shape)
+        self.spins = spins
+        self._code = np.empty(self._half_shape, dtype=np.int8)
+        self._flip = np.empty(self._half_shape, dtype=bool)
+        self._table_key = None
+
+    def _acceptance_table(self):
+        # uint32 thresholds on a 32-bit uniform draw, indexed by 2*(neighbour sum) + s + 9;
+        # the neighbour sum is always even, so s = +1 exactly when the code is 1 mod 4
+        key = (self.J, self.B, self.T, self.moment)
+        if key != self._table_key:
+            code = np.arange(19) - 9
+            s = np.where(code % 4 == 1, 1, -1)
+            nn = (code - s) // 2
+            dE = 2*s*(self.J*nn + self.moment*self.B)
+            with np.errstate(divide="ignore", over="ignore"):
+                if self.T > 0:
+                    p = np.minimum(1.0, np.exp(-dE / self.T))
+                else:
+                    p = (dE <= 0).astype(float)
+            self._table = np.minimum(np.round(p * 2.0**32), 2**32 - 1).astype(np.uint32)
+            self._table_key = key
+        return self._table
+
+    def _update(self, colour):
+        s = self._halves[colour]
+        code, flip = self._code, self._flip
+        np.multiply(self._neighbour_sum(colour), 2, out=code)
+        code += s
+        code += 9
+        threshold = np.take(self._acceptance_table(), code)
+        u = self.rng.bit_generator.random_raw(s.size // 2 + 1).view(np.uint32)[:s.size]
+        np.less(u.reshape(s.shape), threshold, out=flip)
+        # -2 = 0b11111110 toggles between +1 and -1 under XOR
+        np.multiply(flip.view(np.int8), -2, out=code)
+        np.bitwise_xor(s, code, out=s)
+
+    def magnetization(self):
+        return float(sum(np.sum(h, dtype=np.int64) for h in self._halves)) / self.n_sites
+
+    def energy(self):
+        s = self.spins.astype(float)
+        bonds = s*np.roll(s, 1, axis=0) + s*np.roll(s, 1, axis=1)
+        return float(-self.J*np.sum(bonds) - self.moment*self.B*np.sum(s))
+
+    def arrows(self):
+        """(u, v) components for a quiver plot, field direction drawn as +v."""
+        return np.zeros(self.shape), self.spins.astype(float)
+
+
+class HeisenbergLattice(_CheckerboardLattice):
+    """Classical unit-vector spins; proposals rotate each spin by a random kick of size ``step``."""
+
+    _dtype = float
+    _site_shape = (3,)
+
+    def __init__(self, shape, J=1.0, B=0.0, T=1.0, moment=1.0, seed=None, spins=None, step=0.5):
+        super().__init__(shape, J, B, T, moment, seed)
+        if spins is None:
+            spins = self._normalize(self.rng.standard_normal(self.shape + (3,)))
+        self.spins = spins
+        self.step = step
+
+    @staticmethod
+    def _normalize(v):
+        return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+    def _update(self, colour):
+        S = self._halves[colour]
+        field = self._neighbour_sum(colour)
+        field *= self.J
+        field[..., 2] += self.moment*self.B
+        trial = self._normalize(S + self.step*self.rng.standard_normal(S.shape))
+        dE = -np.einsum("ijk,ijk->ij", trial - S, field)
+        with np.errstate(over="ignore", divide="ignore"):
+            if self.T > 0:
+                accept = self.rng.random(self._half_shape) < np.exp(-dE / self.T)
+            else:
+                accept = dE <= 0
+        S[accept] = trial[accept]
+
+    def magnetization(self):
+        return float(sum(np.sum(h[..., 2]) for h in self._halves)) / self.n_sites
+
+    def energy(self):
+        S = self.spins
+        bonds = (np.einsum("ijk,ijk->", S, np.roll(S, 1, axis=0))
+                 + np.einsum("ijk,ijk->", S, np.roll(S, 1, axis=1)))
+        return float(-self.J*bonds - self.moment*self.B*np.sum(S[..., 2]))
+
+    def arrows(self):
+        """(u, v) = (S^x, S^z), with the field direction drawn as +v."""
+        S = self.spins
+        return S[..., 0], S[..., 2]
@@ -0,0 +1,179 @@
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Bbox, IdentityTransform
+
+
+def coarse_grain(field, block):
+    """Average ``field`` over ``block`` x ``block`` tiles, dropping any ragged edge."""
+    if block <= 1:
+        return field
+    rows, cols = field.shape[0] // block, field.shape[1] // block
+    tiles = field[:rows*block, :cols*block].reshape(rows, block, cols, block)
+    return tiles.mean(axis=(1, 3))
+
+
+# --- Colour-code image drawn by table lookup ---
+# An image of intp colour codes whose make_image() skips matplotlib's
+# resampling and normalisation: each screen pixel of the clipped image keeps
+# the flat index of the code it shows, rebuilt only when the extent, the
+# view or the canvas changes, and a frame is two np.take calls into
+# preallocated buffers (code per pixel, then RGBA per code).
+class _LookupImage(AxesImage):
+
+    def __init__(self, ax, lut, **kwargs):
+        super().__init__(ax, interpolation="nearest", **kwargs)
+        self.lut = lut
+        self._map_key = None
+
+    def _pixel_map(self, box, clip, shape):
+        l, b = int(np.floor(clip.x0)), int(np.floor(clip.y0))
+        w, h = int(np.ceil(clip.x1)) - l, int(np.ceil(clip.y1)) - b
+        rows, cols = shape
+        # Pixel centres as fractions of the (possibly inverted) extent; the
+        # renderer puts row 0 of the returned image at the bottom
+        fx = (l + np.arange(w) + 0.5 - box.x0) / box.width
+        fy = (b + np.arange(h) + 0.5 - box.y0) / box.height
+        col = np.clip((fx*cols).astype(np.intp), 0, cols - 1)
+        row = np.clip((fy*rows).astype(np.intp), 0, rows - 1)
+        if self.origin == "upper":
+            row = rows - 1 - row
+        self._flat = row[:, None]*cols + col[None, :]
+        self._pixels = np.empty((h, w), dtype=np.intp)
+        self._rgba = np.empty((h, w, 4), dtype=np.uint8)
+        self._corner = (l, b)
+
+    def make_image(self, renderer, magnification=1.0, unsampled=False):
+        x0, x1, y0, y1 = self.get_extent()
+        # Corners mapped one by one: a TransformedBbox would drop an axis inversion
+        box = Bbox(self.get_transform().transform([[x0, y0], [x1, y1]]))
+        clip = Bbox.intersection(box, self.get_clip_box() or self.axes.bbox)
+        if clip is None or clip.width < 1 or clip.height < 1:
+            return None, 0, 0, None
+        codes = self.get_array()
+        key = (tuple(box.bounds), tuple(clip.bounds), codes.shape)
+        if key != self._map_key:
+            self._pixel_map(box, clip, codes.shape)
+            self._map_key = key
+        # mode="clip": the default "raise" buffers ``out``
+        np.take(codes.ravel(), self._flat, out=self._pixels, mode="clip")
+        np.take(self.lut, self._pixels, axis=0, out=self._rgba, mode="clip")
+        return self._rgba, *self._corner, IdentityTransform()
+
+
+# --- Level-of-detail spin renderer ---
+# Small lattices are drawn as a quiver, one arrow per spin.  Above
+# ``max_arrows`` the S^z component is shown as an image instead, averaged
+# over blocks whenever the visible part of the lattice has more sites than
+# the axes has pixels.  S^z is block-summed and scaled into preallocated
+# buffers, stored as one of 256 colour codes in the image's own array, and
+# drawn by _LookupImage, so an update allocates nothing.
+# Either artist is animated and redrawn by blitting onto a cached
+# background, so a spin update only repaints the spin axes.
+class SpinLatticeView:
+
+    def __init__(self, ax, shape, spacing=1.0, max_arrows=4096, cmap="coolwarm", **quiver_kw):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.shape = tuple(shape)
+        self.spacing = spacing
+        self.block = 1
+        self._v = np.zeros(self.shape, dtype=np.float32)
+        self._background = None
+        rows, cols = self.shape
+
+        if rows*cols <= max_arrows:
+            self.mode = "quiver"
+            x, y = np.meshgrid(np.arange(cols)*spacing, np.arange(rows)*spacing)
+            self.artist = ax.quiver(x.ravel(), y.ravel(), np.zeros(rows*cols), np.ones(rows*cols),
+                                    animated=True, **quiver_kw)
+        else:
+            self.mode = "image"
+            lut = (plt.get_cmap(cmap)(np.linspace(0, 1, 256))*255).astype(np.uint8)
+            self.artist = _LookupImage(ax, lut, origin="lower", animated=True)
+            ax.add_image(self.artist)
+            ax.set_aspect(plt.rcParams["image.aspect"])     # as imshow would
+            self._resize_buffers()
+            self._refresh_image()
+            ax.callbacks.connect("xlim_changed", self._on_zoom)
+            ax.callbacks.connect("ylim_changed", self._on_zoom)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _extent(self, data_shape):
+        # Pixel centres on the lattice sites; coarse blocks cover block x block sites
+        h = self.spacing / 2
+        return (-h, data_shape[1]*self.block*self.spacing - h,
+                -h, data_shape[0]*self.block*self.spacing - h)
+
+    def _fit_block(self):
+        bbox = self.ax.get_window_extent()
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        visible_cols = min(self.shape[1], (x1 - x0) / self.spacing)
+        visible_rows = min(self.shape[0], (y1 - y0) / self.spacing)
+        return max(1, int(np.ceil(max(visible_cols / max(bbox.width, 1),
+                                      visible_rows / max(bbox.height, 1)))))
+
+    def _resize_buffers(self):
+        # Per block size: row sums, block sums and the code image they map to
+        shape = (self.shape[0] // self.block, self.shape[1] // self.block)
+        self._row_sums = np.empty((shape[0], shape[1]*self.block), dtype=np.float32)
+        self._sums = np.empty(shape, dtype=np.float32)
+        self.artist.set_data(np.zeros(shape, dtype=np.intp))
+        self.artist.set_extent(self._extent(shape))
+        self._codes = self.artist.get_array()
+
+    def _refresh_image(self):
+        b = self.block
+        rows, cols = self._sums.shape
+        # Strided adds, rows then columns; a sum over two axes of a 4D view is far slower
+        np.copyto(self._row_sums, self._v[0:rows*b:b, :cols*b])
+        for i in range(1, b):
+            self._row_sums += self._v[i:rows*b:b, :cols*b]
+        np.copyto(self._sums, self._row_sums[:, 0::b])
+        for j in range(1, b):
+            self._sums += self._row_sums[:, j::b]
+        # Mean in [-1, 1] -> code in [0, 255]
+        self._sums *= 127.5 / (b*b)
+        self._sums += 127.5
+        np.clip(self._sums, 0, 255, out=self._sums)
+        np.copyto(self._codes, self._sums, casting="unsafe")
+        self.artist.stale = True
+
+    def _set_block(self, block):
+        if block != self.block:
+            self.block = block
+            self._resize_buffers()
+            self._refresh_image()
+
+    def _on_zoom(self, ax):
+        self._set_block(self._fit_block())
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.artist)
+
+    def set_spins(self, u, v):
+        """Store new spin components (each of ``shape``, in [-1, 1]) without drawing."""
+        if self.mode == "quiver":
+            self.artist.set_UVC(np.ravel(u), np.ravel(v))
+        else:
+            np.copyto(self._v, np.reshape(v, self.shape))
+            block = self._fit_block()
+            if block != self.block:
+                self._set_block(block)
+            else:
+                self._refresh_image()
+
+    def blit(self):
+        """Repaint only the spin axes; falls back to a full draw before the first one."""
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def update(self, u, v):
+        self.set_spins(u, v)
+        self.blit()
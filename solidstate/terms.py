@@ -0,0 +1,132 @@
+import re
+from functools import lru_cache
+from itertools import chain, combinations
+from math import comb
+
+import numpy as np
+
+L_LETTERS = "SPDFGHIKLMNOQRTUVWXYZ"
+_SHELL_LETTERS = "spdfghiklmnoqrtuv"
+_SHELL = re.compile(r"(\d*)([a-z])\^?(\d*)")
+
+
+def parse_configuration(text):
+    """Parse e.g. ``"d5"``, ``"4f7"`` or ``"2p1 3p1"`` into ``((l, n), ...)``.
+
+    Shells are separated by spaces or dots; a missing electron count means 1.
+    """
+    shells = []
+    for token in re.split(r"[\s.]+", text.strip().lower()):
+        match = _SHELL.fullmatch(token)
+        if match is None:
+            raise ValueError(f"cannot parse subshell {token!r} in {text!r}")
+        _, letter, count = match.groups()
+        if letter not in _SHELL_LETTERS:
+            raise ValueError(f"unknown subshell letter {letter!r} in {text!r}")
+        l = _SHELL_LETTERS.index(letter)
+        n = int(count) if count else 1
+        if n > 2*(2*l + 1):
+            raise ValueError(f"{n} electrons do not fit in an l={l} subshell")
+        shells.append((l, n))
+    return tuple(shells)
+
+
+# --- Microstates as bitmasks ---
+# Spin-orbital (ml, ms) of an l subshell is bit 2 (ml + l) + (0 for ms = +1/2,
+# 1 for ms = -1/2).  A Pauli-allowed microstate of n electrons is a mask with
+# n set bits.  Only those C(4l+2, n) subsets are generated, as rows of
+# occupied spin-orbitals, and M_L, 2 M_S are sums over each row.
+def shell_microstates(l, n):
+    """All microstates of l^n: ``(masks, M_L, two_M_S)`` as arrays."""
+    n_orbitals = 2*(2*l + 1)
+    if n_orbitals > 64:
+        raise ValueError(f"an l={l} subshell has more spin-orbitals than a 64-bit mask holds")
+    count = comb(n_orbitals, n)
+    occupied = np.fromiter(chain.from_iterable(combinations(range(n_orbitals), n)),
+                           dtype=np.intp, count=count*n).reshape(count, n)
+    masks = np.bitwise_or.reduce(np.uint64(1) << occupied.astype(np.uint64), axis=1)
+    orbital = np.arange(n_orbitals)
+    ml = orbital // 2 - l
+    two_ms = 1 - 2*(orbital % 2)
+    return masks, ml[occupied].sum(axis=1), two_ms[occupied].sum(axis=1)
+
+
+@lru_cache(maxsize=64)
+def _shell_table(l, n):
+    # Counts indexed [M_L + n l, (2 M_S + n) // 2]; 2 M_S has the parity of n
+    _, ML, two_MS = shell_microstates(l, n)
+    table = np.zeros((2*n*l + 1, n + 1), dtype=np.int64)
+    np.add.at(table, (ML + n*l, (two_MS + n)//2), 1)
+    return table
+
+
+def _convolve(a, b):
+    # Exact integer 2D convolution, one shifted copy of b per nonzero entry of a
+    out = np.zeros((a.shape[0] + b.shape[0] - 1, a.shape[1] + b.shape[1] - 1), dtype=np.int64)
+    for (i, j), count in zip(np.argwhere(a), a[a != 0]):
+        out[i:i + b.shape[0], j:j + b.shape[1]] += count*b
+    return out
+
+
+def microstate_table(configuration):
+    """Tally microstates of a configuration into an (M_L, M_S) count array.
+
+    Returns ``(ML, MS, counts)`` with ``counts[i, j]`` the number of
+    microstates with M_L = ML[i] and M_S = MS[j].  Shells are independent,
+    so the table of a multi-shell configuration is the 2D convolution of the
+    single-shell tables.
+    """
+    shells = parse_configuration(configuration) if isinstance(configuration, str) else configuration
+    counts = np.ones((1, 1), dtype=np.int64)
+    L_max = n_total = 0
+    for l, n in shells:
+        counts = _convolve(counts, _shell_table(l, n))
+        L_max += n*l
+        n_total += n
+    ML = np.arange(-L_max, L_max + 1)
+    MS = np.arange(counts.shape[1]) - n_total/2
+    return ML, MS, counts
+
+
+def terms(configuration):
+    """Term list ``[(L, S, count), ...]`` in Hund's order (S, then L, descending).
+
+    A term (L, S) owns one microstate at every (M_L, M_S) with |M_L| <= L,
+    |M_S| <= S, so the number of terms with exactly (L, S) is the mixed
+    second difference of the table at M_L = L, M_S = S.
+    """
+    ML, MS, counts = microstate_table(configuration)
+    quadrant = counts[ML >= 0][:, MS >= 0]
+    padded = np.pad(quadrant, ((0, 1), (0, 1)))
+    n_terms = padded[:-1, :-1] - padded[1:, :-1] - padded[:-1, 1:] + padded[1:, 1:]
+    L, j = np.nonzero(n_terms)
+    S = MS[MS >= 0][j]
+    order = np.lexsort((-L, -S))
+    return [(int(L[i]), float(S[i]), int(n_terms[L[i], j[i]])) for i in order]
+
+
+def hund_ground_term(configuration):
+    """Ground term ``(L, S, J)`` by Hund's rules.
+
+    Maximum S, then maximum L; J = |L - S| when the open shells hold at most
+    half their capacity and J = L + S beyond that.  For several open shells
+    the filling is that of the open shells taken together.
+    """
+    shells = parse_configuration(configuration) if isinstance(configuration, str) else configuration
+    L, S, _ = terms(shells)[0]
+    open_shells = [(l, n) for l, n in shells if 0 < n < 2*(2*l + 1)]
+    electrons = sum(n for _, n in open_shells)
+    capacity = sum(2*(2*l + 1) for l, _ in open_shells)
+    J = L + S if 2*electrons > capacity else abs(L - S)
+    return L, S, J
+
+
+def _half_integer(x):
+    return f"{int(2*x)}/2" if (2*x) % 2 else f"{int(x)}"
+
+
+def term_symbol(L, S, J=None):
+    """Spectroscopic notation, e.g. ``term_symbol(0, 2.5, 2.5) == "6S5/2"``."""
+    letter = L_LETTERS[L] if L < len(L_LETTERS) else f"[{L}]"
+    symbol = f"{int(round(2*S)) + 1}{letter}"
+    return symbol if J is None else symbol + _half_integer(J)
@@ -0,0 +1,324 @@
+import math
+
+import numpy as np
+
+# --- Transfer matrices of piecewise-flat potentials ---
+# Units ħ²/2m = 1, as in the scripts (E = α²).  A chain is a sequence of flat
+# segments (V_j, d_j).  On a segment with q² = E - V the pair (ψ, ψ') is
+# carried across by the real, unimodular matrix
+#     [[cos qd,     sin(qd)/q],         E > V
+#      [-q sin qd,  cos qd   ]]
+#     [[cosh κd,    sinh(κd)/κ],        E < V,  κ² = V - E
+#      [κ sinh κd,  cosh κd   ]]
+# Under a barrier the entries grow like e^{κd}, so every matrix is stored as
+# (M, s) with the true matrix e^s M and the entries of M of order one.  The
+# product over the chain is formed as a pairwise tree over blocks of
+# segments, for a chunk of energies at a time, with all 2x2 products of a
+# tree level done in one broadcast expression.  Matrices are laid out as
+# (2, 2, ..., n_E): energy is the contiguous axis.
+def segment_matrices(E, V, d, out=None):
+    """Scaled transfer matrices of flat segments: ``M`` (2, 2, n_seg, n_E) and log scale ``s`` (n_seg, n_E).
+
+    ``out=(M, s)`` fills given arrays of those shapes; the intermediates are
+    built in their planes, so nothing else of that size is allocated.
+    """
+    E = np.asarray(E, dtype=float)[None, :]
+    V = np.asarray(V, dtype=float)[:, None]
+    d = np.asarray(d, dtype=float)[:, None]
+    shape = (V.shape[0], E.shape[1])
+    M, s = (np.empty((2, 2) + shape), np.empty(shape)) if out is None else out
+    cos_x, q, sin_x, x = M[0, 0], M[0, 1], M[1, 0], M[1, 1]
+    np.subtract(E, V, out=s)
+    evanescent = s < 0
+    np.abs(s, out=q)
+    np.sqrt(q, out=q)
+    zero = q == 0
+    np.multiply(q, d, out=x)
+    # cos and sin from t = tan(x/2): cos = 2/(1 + t²) - 1, sin = t 2/(1 + t²).
+    # numpy vectorizes tan but not cos/sin, so this is several times cheaper
+    # than calling both, and exact to round-off (|t| stays below ~1e16).
+    np.multiply(x, 0.5, out=sin_x)
+    np.tan(sin_x, out=sin_x)
+    np.multiply(sin_x, sin_x, out=cos_x)
+    cos_x += 1.0
+    np.divide(2.0, cos_x, out=cos_x)
+    sin_x *= cos_x
+    cos_x -= 1.0
+    # Under a barrier, with the e^{κd} taken out: cosh -> 1 - h, sinh -> h, h = (1 - e^{-2κd})/2
+    if evanescent.any():
+        h = np.multiply(x, -2.0, out=s)
+        np.expm1(h, out=h)
+        h *= -0.5
+        np.copyto(sin_x, h, where=evanescent)
+        np.subtract(1.0, h, out=cos_x, where=evanescent)
+    np.multiply(x, evanescent, out=s)
+    # M[1, 0] is -q sin qd above the barrier and κ sinh κd under it; M[0, 1]
+    # is sin(qd)/q or sinh(κd)e^{-κd}/κ, both sin_x/q, with limit d at q = 0.
+    # x's plane holds q sin_x meanwhile.
+    sin_q = np.multiply(sin_x, q, out=x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(sin_x, q, out=q)
+    if zero.any():
+        np.copyto(q, np.broadcast_to(d, shape), where=zero)
+    np.negative(sin_q, out=sin_x)
+    np.copyto(sin_x, sin_q, where=evanescent)
+    np.copyto(M[1, 1], cos_x)
+    return M, s
+
+
+def _tree_plan(ids):
+    # Pairwise product tree over a sequence of kind ids, built once for all
+    # energies.  Level by level, neighbours are paired (later, earlier) and
+    # every distinct pair becomes a kind of the next level, so a pair that
+    # recurs is multiplied only once; an unpaired last element is carried up.
+    # Once all pairs of a level are distinct they stay so, and every later
+    # level is a plain strided halving of the one before.
+    levels = []
+    n_kinds = int(ids.max()) + 1 if ids.size else 0
+    distinct = strided = False
+    while ids.size > 1:
+        n = ids.size & ~1
+        carry = ids[n:]
+        if not distinct:
+            pairs, new_ids = np.unique(ids[1:n:2]*n_kinds + ids[0:n:2], return_inverse=True)
+            distinct = pairs.size == n // 2
+        if strided:
+            later, earlier = slice(1, n, 2), slice(0, n, 2)
+        elif distinct:
+            later, earlier = ids[1:n:2], ids[0:n:2]
+        else:
+            later, earlier = np.divmod(pairs, n_kinds)
+        if distinct:
+            # Positions and kinds coincide from here on
+            new_ids = np.arange(n // 2)
+            strided = True
+        n_pairs = new_ids.max() + 1
+        levels.append((_as_slice(later), _as_slice(earlier), carry))
+        ids = np.concatenate([new_ids, n_pairs + np.arange(carry.size)])
+        n_kinds = n_pairs + carry.size
+    return levels
+
+
+def _as_slice(ids):
+    # Index runs in arithmetic progression are taken as views instead of
+    # gathered: a step of 0 (one kind all along a level, like the wells of a
+    # barrier-disordered chain) broadcasts, a positive step strides.
+    if not isinstance(ids, np.ndarray) or ids.size < 2:
+        return ids
+    start, step = int(ids[0]), int(ids[1] - ids[0])
+    if step < 0 or (ids != start + step*np.arange(ids.size)).any():
+        return ids
+    if step == 0:
+        return slice(start, start + 1)
+    return slice(start, start + step*ids.size, step)
+
+
+def _scratch(work, key, shape):
+    # A C-contiguous view of a reusable buffer.  The trees run level after
+    # level on arrays of a few MiB, and allocating each afresh costs about
+    # as much in page faults as the arithmetic.
+    size = math.prod(shape)
+    buf = work.get(key)
+    if buf is None or buf.size < size:
+        buf = work[key] = np.empty(size)
+    return buf[:size].reshape(shape)
+
+
+def _take(M, s, index, work, key):
+    if isinstance(index, slice):
+        return M[:, :, index], s[index]
+    n, n_E = index.size, s.shape[1]
+    return (np.take(M, index, axis=2, out=_scratch(work, key + "M", (2, 2, n, n_E)), mode="clip"),
+            np.take(s, index, axis=0, out=_scratch(work, key + "s", (n, n_E)), mode="clip"))
+
+
+def _run_plan(levels, M, s, work, tag=""):
+    # Each level multiplies the (later, earlier) pairs of the previous level
+    # into the other buffer of a ping-pong pair; einsum runs the 2x2
+    # contraction without broadcast temporaries.  Segment entries are at most
+    # max(1, d, q), so three levels (products of eight) can go unnormalized
+    # without any risk of overflow; the norm is the largest |entry|.
+    n_E = s.shape[1]
+    for depth, (later, earlier, carry) in enumerate(levels, 1):
+        A, sA = _take(M, s, later, work, "later")
+        B, sB = _take(M, s, earlier, work, "earlier")
+        n = max(sA.shape[0], sB.shape[0])
+        key = f"{tag}{depth % 2}"
+        C = _scratch(work, key + "M", (2, 2, n + carry.size, n_E))
+        sC = _scratch(work, key + "s", (n + carry.size, n_E))
+        np.einsum("ij...,jk...->ik...", A, B, out=C[:, :, :n])
+        np.add(sA, sB, out=sC[:n])
+        if depth % 3 == 0 or depth == len(levels):
+            norm = np.abs(C[:, :, :n], out=_scratch(work, "abs", (2, 2, n, n_E))).max(
+                axis=(0, 1), out=_scratch(work, "norm", (n, n_E)))
+            C[:, :, :n] /= norm
+            sC[:n] += np.log(norm, out=norm)
+        if carry.size:
+            C[:, :, n:] = M[:, :, carry]
+            sC[n:] = s[carry]
+        M, s = C, sC
+    return M[:, :, 0], s[0]
+
+
+def _chain_energies(E, plan, energy_chunk, M_out=None, s_out=None):
+    # The chain product at the energies E, one energy chunk at a time
+    kinds, tabulate, block_plans, top_plan = plan
+    if M_out is None:
+        M_out, s_out = np.empty((2, 2, E.size)), np.empty(E.size)
+    work = {}
+    n_kinds, n_blocks = kinds.shape[1], len(block_plans)
+    for e0 in range(0, E.size, energy_chunk):
+        Ec = E[e0:e0 + energy_chunk]
+        n_E = Ec.size
+        if tabulate:
+            table = segment_matrices(Ec, kinds[0], kinds[1], out=(
+                _scratch(work, "tableM", (2, 2, n_kinds, n_E)), _scratch(work, "tables", (n_kinds, n_E))))
+        products = _scratch(work, "productsM", (2, 2, n_blocks, n_E))
+        products_s = _scratch(work, "productss", (n_blocks, n_E))
+        for b, (used, block_plan) in enumerate(block_plans):
+            if tabulate:
+                Mb, sb = _take(*table, used, work, "segments")
+            else:
+                Mb, sb = segment_matrices(Ec, kinds[0, used], kinds[1, used], out=(
+                    _scratch(work, "segmentsM", (2, 2, used.size, n_E)), _scratch(work, "segmentss", (used.size, n_E))))
+            products[:, :, b], products_s[b] = _run_plan(block_plan, Mb, sb, work)
+        M_out[:, :, e0:e0 + n_E], s_out[e0:e0 + n_E] = _run_plan(top_plan, products, products_s, work, "top")
+    return M_out, s_out
+
+
+def _chain_energies_task(args):
+    return _chain_energies(*args)
+
+
+def chain_matrix(E, V, d, energy_chunk=256, block=256, processes=None):
+    """Transfer matrix of the whole chain at every energy, as ``(M, s)``.
+
+    ``M`` has shape ``(2, 2) + np.shape(E)`` and the true matrix is
+    ``exp(s) * M``.  The chain is cut into blocks of ``block`` segments;
+    each distinct block is reduced by a pairwise tree and the block products
+    by another, for ``energy_chunk`` energies at a time, so memory stays at
+    a few (block x energy_chunk) stacks whatever the chain length.  Repeats
+    are multiplied once: a periodic chain costs O(log N) products per
+    energy, a binary random chain a small fraction of N.  Energies are
+    independent, so with ``processes`` > 1 the energy chunks are split
+    across that many worker processes.
+
+    A chain with continuous disorder has no repeats, so every segment is
+    built and multiplied at every energy, about 24 ns per segment and
+    energy on one core: 10⁴ cells x 10³ energies take ~0.5 s, 10⁵ x 10⁴
+    ~48 s, and ``processes`` divides that by the number of cores (periodic:
+    ~0.3 s, binary: ~12 s).  Randomizing the barrier widths as well makes
+    the wells distinct too, about 1.5 times the cost.
+    """
+    E = np.asarray(E, dtype=float)
+    V, d = np.broadcast_arrays(np.asarray(V, dtype=float).ravel(), np.asarray(d, dtype=float).ravel())
+    flat_E = E.ravel()
+    M_out = np.empty((2, 2, flat_E.size))
+    s_out = np.empty(flat_E.size)
+    if V.size == 0:
+        M_out[:] = np.eye(2)[..., None]
+        s_out[:] = 0.0
+        return M_out.reshape((2, 2) + E.shape), s_out.reshape(E.shape)
+
+    # The plans depend only on the sequence of segment kinds, not on energy
+    kinds, kind_ids = np.unique(np.stack([V, d]), axis=1, return_inverse=True)
+    kind_ids = kind_ids.ravel()
+    tabulate = kinds.shape[1] <= block
+    block_plans, block_ids, seen = [], [], {}
+    for j0 in range(0, V.size, block):
+        ids = kind_ids[j0:j0 + block]
+        key = ids.tobytes()
+        if key not in seen:
+            seen[key] = len(block_plans)
+            used, first, local = np.unique(ids, return_index=True, return_inverse=True)
+            # Number the kinds in order of first appearance, so the tree of a
+            # block of mostly distinct segments starts on views, not gathers
+            order = np.argsort(first)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(order.size)
+            used, local = used[order], rank[local]
+            block_plans.append((used, _tree_plan(local)))
+        block_ids.append(seen[key])
+    plan = (kinds, tabulate, block_plans, _tree_plan(np.array(block_ids)))
+
+    n_chunks = -(-flat_E.size // energy_chunk)
+    if processes is None or processes <= 1 or n_chunks <= 1:
+        _chain_energies(flat_E, plan, energy_chunk, M_out, s_out)
+    else:
+        # Whole energy chunks per worker, in order
+        from concurrent.futures import ProcessPoolExecutor
+        groups = np.array_split(np.arange(n_chunks), min(processes, n_chunks))
+        bounds = [energy_chunk*int(g[0]) for g in groups] + [flat_E.size]
+        spans = list(zip(bounds[:-1], bounds[1:]))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = pool.map(_chain_energies_task, [(flat_E[lo:hi], plan, energy_chunk) for lo, hi in spans])
+            for (lo, hi), (M, s) in zip(spans, results):
+                M_out[:, :, lo:hi], s_out[lo:hi] = M, s
+    return M_out.reshape((2, 2) + E.shape), s_out.reshape(E.shape)
+
+
+# --- Observables of the total matrix ---
+def half_trace(M, s):
+    """tr(T)/2 = cos(kL) for one period of a periodic chain; |tr(T)/2| <= 1 inside a band."""
+    with np.errstate(over="ignore"):
+        return 0.5*(M[0, 0] + M[1, 1])*np.exp(s)
+
+
+def allowed(M, s):
+    """Mask of energies inside a band of the periodic chain with period matrix ``(M, s)``."""
+    with np.errstate(divide="ignore"):
+        return np.log(np.abs(0.5*(M[0, 0] + M[1, 1]))) + s <= 0
+
+
+def bands(E, V, d):
+    """Allowed intervals ``(E_low, E_high)`` of the periodic chain with one period ``(V, d)``, on the grid E."""
+    E = np.sort(np.asarray(E, dtype=float).ravel())
+    inside = allowed(*chain_matrix(E, V, d)).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], inside, [0]])))
+    return np.stack([E[edges[0::2]], E[edges[1::2] - 1]], axis=-1)
+
+
+def log_transmission(E, M, s):
+    """ln T for the chain between flat V = 0 leads (E > 0).
+
+    With lead wavenumber k = sqrt(E),
+    T = 4 / ((m11 + m22)² + (k m12 - m21/k)²).
+    """
+    k = np.sqrt(np.asarray(E, dtype=float))
+    with np.errstate(divide="ignore"):
+        return np.log(4.0) - 2*s - np.log((M[0, 0] + M[1, 1])**2 + (k*M[0, 1] - M[1, 0]/k)**2)
+
+
+def transmission(E, M, s):
+    return np.exp(log_transmission(E, M, s))
+
+
+def localization_length(M, s, length):
+    """1/γ with γ = ln||T|| / L the Lyapunov exponent of a chain of total ``length``."""
+    gamma = (s + np.log(np.sqrt(np.sum(M**2, axis=(0, 1))))) / length
+    with np.errstate(divide="ignore"):
+        return 1 / gamma
+
+
+# --- Kronig–Penney chains ---
+def barrier_height(P, a=1.0, b=0.01):
+    """V0 of a width-``b`` barrier whose b -> 0 limit is the script's delta comb of strength P."""
+    return 2*P / (a*b)
+
+
+def kp_chain(n_cells, a=1.0, b=0.1, V0=1.0, dV=0.0, db=0.0, seed=None):
+    """Segments ``(V, d)`` of n_cells wells of width a - b, each followed by a barrier.
+
+    ``dV`` and ``db`` spread the barrier heights and widths uniformly by that
+    full width around V0 and b (the cell length stays a); with both zero the
+    chain is periodic and a single cell is its period.
+    """
+    rng = np.random.default_rng(seed)
+    V_b = V0 + dV*(rng.random(n_cells) - 0.5) if dV else np.full(n_cells, float(V0))
+    d_b = b + db*(rng.random(n_cells) - 0.5) if db else np.full(n_cells, float(b))
+    V = np.zeros((n_cells, 2))
+    d = np.empty((n_cells, 2))
+    V[:, 1] = V_b
+    d[:, 0] = a - d_b
+    d[:, 1] = d_b
+    return V.ravel(), d.ravel()
@@ -0,0 +1,50 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+# --- Plane-wave displacement field as an image ---
+# u(r, t) = A sin(k·r - ωt) over a rows x cols layer of atoms, coloured by
+# u.  The phase k·r is quantized once per wavevector to 1/256 of a turn and
+# kept as uint8, and the colour of each of the 256 phase steps is tabulated.
+# Advancing the wave by ωt is then one wrapping uint8 subtraction, stored
+# straight into an intp index buffer (np.take would otherwise convert the
+# indices itself), and one table lookup written into the image's own RGBA
+# buffer: a frame allocates nothing, even for 1000 x 1000 atoms.  The image
+# is animated, for blitting by FuncAnimation.
+class WaveFieldView:
+
+    levels = 256
+
+    def __init__(self, ax, shape, spacing=1.0, cmap="coolwarm", layer=0, **imshow_kw):
+        self.ax = ax
+        self.shape = tuple(shape)
+        self.spacing = spacing
+        self.layer = layer          # z index of the plane shown for a cubic lattice
+        rows, cols = self.shape
+        self._x = np.arange(cols)*spacing
+        self._y = np.arange(rows)*spacing
+        self._phase = np.zeros(self.shape, dtype=np.uint8)
+        self._index = np.zeros(self.shape, dtype=np.intp)
+        step = np.arange(self.levels)/self.levels
+        self._lut = (plt.get_cmap(cmap)(0.5 + 0.5*np.sin(2*np.pi*step))*255).astype(np.uint8)
+        h = spacing/2
+        self.artist = ax.imshow(self._lut[self._index], origin="lower", animated=True,
+                                extent=(-h, cols*spacing - h, -h, rows*spacing - h), **imshow_kw)
+        # set_data() copies and range-checks; frames go into the image's buffer instead
+        self._rgba = self.artist.get_array()
+
+    def set_wavevector(self, k):
+        """Select k = (kx, ky) or (kx, ky, kz); allocates, so call it on a change of k only."""
+        k = np.asarray(k, dtype=float)
+        turns = (k[0]*self._x[None, :] + k[1]*self._y[:, None]) / (2*np.pi)
+        if k.size > 2:
+            turns += k[2]*self.layer*self.spacing / (2*np.pi)
+        np.copyto(self._phase, np.mod(np.round(turns*self.levels), self.levels), casting="unsafe")
+
+    def set_phase(self, omega_t):
+        """Show the field at ωt = ``omega_t`` and return the artist to blit."""
+        shift = np.uint8(int(round(omega_t*self.levels/(2*np.pi))) % self.levels)
+        np.subtract(self._phase, shift, out=self._index, casting="unsafe")
+        np.take(self._lut, self._index, axis=0, out=self._rgba, mode="clip")
+        self.artist.stale = True
+        return self.artist
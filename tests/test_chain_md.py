@@ -0,0 +1,16 @@
+import numpy as np
+
+from solidstate.chain_md import ChainMD, spectrum_check
+
+
+def test_md_conserves_energy():
+    md = ChainMD(np.tile([1.0, 2.0], 16), 1.0, alpha=0.1, beta=0.05, dt=0.02)
+    md.set_state(0.1*np.sin(2*np.pi*np.arange(32)/32))
+    e0 = sum(md.energy())
+    md.run(2000)
+    assert abs(sum(md.energy()) - e0) < 1e-4*e0
+
+
+def test_md_peaks_follow_chain_modes():
+    k, expected, measured, resolution = spectrum_check([1.0, 2.0, 3.0], seed=0)
+    assert np.all(np.abs(measured - expected) < resolution)
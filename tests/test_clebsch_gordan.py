@@ -0,0 +1,38 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from solidstate.clebsch_gordan import clebsch_gordan, coupling_table, wigner_3j
+
+
+@pytest.mark.parametrize("j1, j2", [(0.5, 0.5), (1, 0.5), (1, 1), (1.5, 2), (3, 2.5)])
+def test_coupling_table_is_orthogonal(j1, j2):
+    C = coupling_table(j1, j2)[-1]
+    n = C.shape[0]
+    assert n == int((2*j1 + 1)*(2*j2 + 1))
+    np.testing.assert_allclose(C @ C.T, np.eye(n), atol=1e-12)
+    np.testing.assert_allclose(C.T @ C, np.eye(n), atol=1e-12)
+
+
+def test_exact_rows_sum_to_one():
+    C = coupling_table(1, 1.5, exact=True)[-1]
+    for row in C:
+        assert sum(abs(s) for s in row) == 1
+
+
+def test_known_values():
+    # Two spin-1/2: triplet M = 0 and singlet
+    assert clebsch_gordan(0.5, 0.5, 0.5, -0.5, 1, 0) == pytest.approx(np.sqrt(0.5))
+    assert clebsch_gordan(0.5, -0.5, 0.5, 0.5, 0, 0) == pytest.approx(-np.sqrt(0.5))
+    assert clebsch_gordan(1, 1, 0.5, -0.5, 1.5, 0.5, exact=True) == Fraction(1, 3)
+    # Selection rules
+    assert clebsch_gordan(1, 1, 1, 0, 1, 0) == 0
+    assert clebsch_gordan(1, 0, 1, 0, 3, 0) == 0
+
+
+def test_wigner_3j_symmetry():
+    # Even permutations leave a 3j symbol unchanged
+    a = wigner_3j(2, 1, 1, 1, -1, 0)
+    assert a == pytest.approx(wigner_3j(1, 1, 2, -1, 0, 1))
+    assert a == pytest.approx(wigner_3j(1, 2, 1, 0, 1, -1))
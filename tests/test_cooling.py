@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from solidstate import cooling
+from solidstate.paramagnet import Paramagnet
+
+
+@pytest.mark.parametrize("salt", [Paramagnet(0.5), Paramagnet(3.5)])
+def test_entropy_inversion_round_trip(salt):
+    B = 0.3
+    T = np.geomspace(0.05, 3.0, 50)
+    S = salt.entropy(B, T)
+    table = cooling.EntropyTable.covering(salt, B, 3.0)
+    # The inversion converges in S to tol*max(S_max, 1), so T is only as sharp as S/C allows
+    found = table.temperature(S, tol=1e-12)
+    atol = 1e-12*max(table.S[-1], 1.0)
+    np.testing.assert_allclose(salt.entropy(B, found), S, rtol=0, atol=atol)
+    np.testing.assert_allclose(found, T, rtol=1e-6)
+
+
+def test_final_temperature_is_isentropic():
+    salt = Paramagnet(0.5)
+    Ti, Bb = np.array([1.0, 2.0, 2.5]), np.array([1.0, 3.0, 4.0])
+    Tf = cooling.final_temperature(salt, Ti, Bb, 0.01)
+    np.testing.assert_allclose(salt.entropy(0.01, Tf), salt.entropy(Bb, Ti), rtol=1e-10)
+
+
+def test_sweep_resumes_from_disk(tmp_path):
+    salt = Paramagnet(0.5)
+    Ti, Bb = np.linspace(0.5, 2.0, 5), np.linspace(0.5, 3.0, 4)
+    out = tmp_path / "sweep.npy"
+    first = np.array(cooling.cooling_sweep(salt, Ti, Bb, out=out, chunk_size=7))
+    again = cooling.cooling_sweep(salt, Ti, Bb, out=out, chunk_size=7)
+    np.testing.assert_array_equal(first, again)
+    np.testing.assert_allclose(first[0], cooling.final_temperature(salt, Ti[:, None], Bb))
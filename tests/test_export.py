@@ -0,0 +1,29 @@
+import pytest
+
+from solidstate import export
+
+
+@pytest.mark.parametrize("params", [{"config": "d5"}, {"L": 2, "S": 0.3}, {"L": 1, "S": 1.5}])
+def test_coupling_steps_render(params):
+    export.use_agg()
+    state = export.load_demo("coupling", params)
+    for i in range(5):
+        fig = export.DEMOS["coupling"][1](state, i, 5)
+        fig.canvas.draw()
+    app = state["app"]
+    renderer = fig.canvas.get_renderer()
+    # The Clebsch–Gordan panel sits beside the scheme, not on it
+    assert app.cg_ax.get_visible()
+    assert app.cg_ax.get_tightbbox(renderer).x0 > app.ax.bbox.x1
+
+
+@pytest.mark.parametrize("max_labels, notes", [(None, ["+187 more labels (max_labels=150)"]), (1000, [])])
+def test_coupling_label_cap_is_reported(max_labels, notes):
+    export.use_agg()
+    params = {"L": 8, "S": 5}
+    if max_labels is not None:
+        params["max_labels"] = max_labels
+    app = export.load_demo("coupling", params)["app"]
+    app.step = 1
+    app.update_plot()
+    assert [t.get_text() for t in app.layers[0] if "more labels" in getattr(t, "get_text", str)()] == notes
@@ -0,0 +1,35 @@
+import numpy as np
+
+from solidstate import kronig_penney
+
+
+def test_free_electron_limit():
+    # P = 0: no gaps, bands tile αa = 0, π, 2π, ... and m*/m = 1 everywhere
+    edges = kronig_penney.band_edges_alpha(0.0, 4)
+    np.testing.assert_allclose(edges, np.pi*np.array([[0, 1], [1, 2], [2, 3], [3, 4]]))
+    np.testing.assert_array_equal(kronig_penney.effective_masses(0.0, 4), 1.0)
+
+
+def test_effective_masses_finite_for_weak_barrier():
+    masses = kronig_penney.effective_masses(np.array([0.0, 0.5, 5.0]), 4)
+    assert np.all(np.isfinite(masses))
+    # Bottom edges are electron-like, top edges hole-like
+    assert np.all(masses[1:, :, 0] > 0) and np.all(masses[1:, :, 1] < 0)
+
+
+def test_band_edges_satisfy_f_equal_to_plus_minus_one():
+    P = 3.0
+    edges = kronig_penney.band_edges_alpha(P, 6)
+    np.testing.assert_allclose(np.abs(kronig_penney.f_alpha(edges, P)), 1.0, atol=1e-10)
+
+
+def test_band_table_rebuilds_over_a_truncated_archive(tmp_path):
+    path = tmp_path / "table.npz"
+    kwargs = dict(P_min=0.0, P_max=10.0, n_points=11, n_bands=3)
+    table = kronig_penney.BandTable.build(**kwargs)
+    table.save(path)
+    path.write_bytes(path.read_bytes()[:100])
+    again = kronig_penney.BandTable.load_or_build(path, **kwargs)
+    np.testing.assert_array_equal(again.edges, table.edges)
+    np.testing.assert_array_equal(kronig_penney.BandTable.load(path).edges, table.edges)
+    assert [p.name for p in tmp_path.iterdir()] == ["table.npz"]
@@ -0,0 +1,28 @@
+import runpy
+
+import pytest
+
+from solidstate import __main__ as launcher
+from solidstate import profiling
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(runpy, "run_path", lambda path, run_name: calls.append(("run", path)))
+    monkeypatch.setattr(profiling, "enable", lambda trace=None: calls.append(("profile", trace)))
+    return calls
+
+
+@pytest.mark.parametrize("env, argv, expected", [
+    ("0", [], []),
+    ("", [], []),
+    ("1", [], [("profile", None)]),
+    ("out.json", [], [("profile", "out.json")]),
+    ("0", ["--profile"], [("profile", None)]),
+])
+def test_profile_env(monkeypatch, calls, env, argv, expected):
+    monkeypatch.setenv("SOLIDSTATE_PROFILE", env)
+    launcher.main(["kp", *argv])
+    assert [c for c in calls if c[0] == "profile"] == expected
+    assert calls[-1][0] == "run"
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from solidstate import cooling
+from solidstate.paramagnet import MeanFieldSalt, Paramagnet
+
+
+def test_mean_field_salt():
+    # No exchange: the ideal salt; with exchange: a spontaneous moment below T_c only
+    ideal, ordered = Paramagnet(0.5), MeanFieldSalt(0.5, lam=0.5)
+    B, T = np.array([0.0, 0.2, -1.0])[:, None], np.linspace(0.1, 2.0, 9)
+    np.testing.assert_allclose(MeanFieldSalt(0.5).entropy(B, T), ideal.entropy(B, T), atol=1e-14)
+    Tc = ordered.ordering_temperature
+    m, converged = ordered.self_consistent(0.0, np.array([0.5*Tc, 1.5*Tc]))
+    assert converged.all() and m[0] > 0.4 and m[1] == pytest.approx(0.0, abs=1e-12)
+    # C = T dS/dT
+    T, h = np.linspace(0.1, 1.5, 8), 1e-6
+    dS = (ordered.entropy(0.2, T + h) - ordered.entropy(0.2, T - h)) / (2*h)
+    np.testing.assert_allclose(ordered.heat_capacity(0.2, T), T*dS, rtol=1e-6)
+
+
+def test_mean_field_entropy_inversion_round_trip():
+    salt, B = MeanFieldSalt(0.5, lam=0.4), 0.3
+    T = np.geomspace(0.05, 3.0, 50)
+    S = salt.entropy(B, T)
+    table = cooling.EntropyTable.covering(salt, B, 3.0)
+    found = table.temperature(S, tol=1e-12)
+    np.testing.assert_allclose(salt.entropy(B, found), S, rtol=0, atol=1e-12*max(table.S[-1], 1.0))
+    np.testing.assert_allclose(found, T, rtol=1e-6)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from solidstate import phonons
+
+
+def test_chain_modes_reduce_to_diatomic_branches():
+    k = np.linspace(-np.pi, np.pi, 41)
+    omega = phonons.chain_modes(k, [1.0, 2.5], vectors=False)
+    acoustic, optical = phonons.omega_branches(k, 1.0, 2.5)
+    np.testing.assert_allclose(omega, np.c_[acoustic, optical], atol=1e-7)
+
+
+def test_chain_modes_eigenvectors():
+    masses, springs = [1.0, 2.0, 3.0], [1.0, 0.5, 2.0]
+    k = np.linspace(-np.pi, np.pi, 17)
+    omega, e = phonons.chain_modes(k, masses, springs)
+    D = phonons.dynamical_matrix(k, masses, springs)
+    np.testing.assert_allclose(D @ e, e*omega[:, None, :]**2, atol=1e-12)
+    np.testing.assert_allclose(np.conj(np.swapaxes(e, 1, 2)) @ e, np.broadcast_to(np.eye(3), D.shape), atol=1e-12)
+
+
+def test_chain_modes_process_pool_matches_in_process():
+    masses, springs = [1.0, 2.0, 3.0, 1.5], [1.0, 0.5, 2.0, 1.0]
+    k = np.linspace(-np.pi, np.pi, 50)
+    omega, e = phonons.chain_modes(k, masses, springs, chunk_size=7)
+    omega_p, e_p = phonons.chain_modes(k, masses, springs, chunk_size=7, processes=3)
+    np.testing.assert_array_equal(omega_p, omega)
+    np.testing.assert_array_equal(e_p, e)
+
+
+def test_finite_chain_fixed_and_free_spectra():
+    n = 12
+    j = np.arange(n)
+    fixed = phonons.finite_chain_modes(np.ones(n), 1.0, "fixed", vectors=False)
+    np.testing.assert_allclose(fixed, 2*np.sin((j + 1)*np.pi/(2*(n + 1))), atol=1e-12)
+    free = phonons.finite_chain_modes(np.ones(n), 1.0, "free", vectors=False)
+    np.testing.assert_allclose(free, 2*np.sin(j*np.pi/(2*n)), atol=1e-7)
+
+
+def test_light_impurity_mode_is_localized():
+    # Defect of mass m' in a chain of unit masses: ω² = 4 / (m' (2 - m'))
+    n, m_defect = 2001, 0.3
+    masses = np.ones(n)
+    masses[n // 2] = m_defect
+    omega, u = phonons.finite_chain_modes(masses, 1.0, window=(2.01, 10.0))
+    assert omega.size == 1
+    np.testing.assert_allclose(omega[0], 2/np.sqrt(m_defect*(2 - m_defect)), rtol=1e-10)
+    assert phonons.participation_ratio(u)[0] < 3
@@ -0,0 +1,31 @@
+from math import comb
+
+import pytest
+
+from solidstate.terms import hund_ground_term, microstate_table, parse_configuration, term_symbol, terms
+
+
+@pytest.mark.parametrize("configuration, symbol", [
+    ("p2", "3P0"), ("p4", "3P2"), ("d5", "6S5/2"), ("f7", "8S7/2"),
+    ("d6", "5D4"), ("f2", "3H4"), ("4f3", "4I9/2"), ("f14", "1S0"),
+])
+def test_hund_ground_terms(configuration, symbol):
+    assert term_symbol(*hund_ground_term(configuration)) == symbol
+
+
+def test_p2_terms():
+    assert terms("p2") == [(1, 1.0, 1), (2, 0.0, 1), (0, 0.0, 1)]
+
+
+def test_term_multiplicities_add_up_to_microstates():
+    for configuration in ("d3", "f4", "2p1 3p1"):
+        total = sum((2*L + 1)*(2*S + 1)*count for L, S, count in terms(configuration))
+        expected = 1
+        for l, n in parse_configuration(configuration):
+            expected *= comb(2*(2*l + 1), n)
+        assert total == expected == microstate_table(configuration)[2].sum()
+
+
+def test_rejects_overfull_shell():
+    with pytest.raises(ValueError):
+        parse_configuration("p7")
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from solidstate import kronig_penney, transfer_matrix
+
+
+def _direct_product(E, V, d):
+    # Unscaled textbook matrices multiplied one segment at a time
+    T = np.broadcast_to(np.eye(2), (E.size, 2, 2)).copy()
+    for Vj, dj in zip(V, d):
+        q = np.sqrt(E - Vj + 0j)
+        c, s = np.cos(q*dj), np.sin(q*dj)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s_q = np.where(q == 0, dj, s/q)
+        seg = np.stack([np.stack([c, s_q], -1), np.stack([-q*s, c], -1)], -2).real
+        T = seg @ T
+    return T
+
+
+@pytest.mark.parametrize("dV", [0.0, 2.0])
+def test_chain_matrix_matches_direct_product(dV):
+    V, d = transfer_matrix.kp_chain(40, a=1.0, b=0.2, V0=5.0, dV=dV, seed=1)
+    E = np.linspace(0.05, 30, 157)
+    M, s = transfer_matrix.chain_matrix(E, V, d, energy_chunk=64, block=16)
+    T = _direct_product(E, V, d)
+    np.testing.assert_allclose(np.moveaxis(M*np.exp(s), (0, 1), (-2, -1)), T,
+                               rtol=1e-9, atol=1e-9*np.abs(T).max())
+
+
+def test_single_barrier_transmission():
+    # Rectangular barrier, E < V0: T = 1 / (1 + V0² sinh²(κb) / (4 E (V0 - E)))
+    V0, b = 4.0, 0.7
+    E = np.linspace(0.2, 3.8, 7)
+    T = transfer_matrix.transmission(E, *transfer_matrix.chain_matrix(E, [V0], [b]))
+    kappa = np.sqrt(V0 - E)
+    np.testing.assert_allclose(T, 1/(1 + V0**2*np.sinh(kappa*b)**2/(4*E*(V0 - E))), rtol=1e-12)
+
+
+def test_delta_limit_reproduces_kronig_penney_bands():
+    P, a, b = 3.0, 1.0, 1e-4
+    V, d = transfer_matrix.kp_chain(1, a, b, transfer_matrix.barrier_height(P, a, b))
+    E = np.linspace(0.01, 40, 40001)
+    found = transfer_matrix.bands(E, V, d)
+    expected = kronig_penney.band_edges(P, found.shape[0], a)
+    np.testing.assert_allclose(found, expected, atol=5e-3)
+
+
+def test_process_pool_matches_in_process():
+    V, d = transfer_matrix.kp_chain(300, a=1.0, b=0.2, V0=8.0, dV=3.0, seed=2)
+    E = np.linspace(0.1, 40, 1001)
+    M, s = transfer_matrix.chain_matrix(E, V, d, energy_chunk=128)
+    M2, s2 = transfer_matrix.chain_matrix(E, V, d, energy_chunk=128, processes=3)
+    np.testing.assert_array_equal(M2, M)
+    np.testing.assert_array_equal(s2, s)
+
+
+def test_segment_matrices_out_and_unimodularity():
+    E = np.linspace(0.0, 10.0, 41)
+    V, d = np.array([0.0, 2.5, 10.0]), np.array([0.7, 0.3, 1.1])
+    M, s = transfer_matrix.segment_matrices(E, V, d)
+    out = (np.full_like(M, np.nan), np.full_like(s, np.nan))
+    M2, s2 = transfer_matrix.segment_matrices(E, V, d, out=out)
+    assert M2 is out[0] and s2 is out[1]
+    np.testing.assert_array_equal(M2, M)
+    # det(e^s M) = 1 for every segment, at the band edge E = V too
+    np.testing.assert_allclose((M[0, 0]*M[1, 1] - M[0, 1]*M[1, 0])*np.exp(2*s), 1.0, rtol=1e-13)